@@ -12,6 +12,7 @@ from dataclasses import dataclass
 from datetime import datetime, time
 import re
 from config import *
+from supplemental_data_provider import SupplementalDataProvider
 
 logger = logging.getLogger(__name__)
 
@@ -147,9 +148,6 @@ class EnhancedAIAssistant:
     async def _get_market_index_data(self, symbol: str) -> Optional[Dict]:
         """Get market index data for analysis"""
         try:
-            # Import here to avoid circular imports
-            from supplemental_data_provider import SupplementalDataProvider
-            
             data_provider = SupplementalDataProvider()
             await data_provider.initialize()  # CRITICAL: Initialize the session
             
@@ -170,7 +168,7 @@ class EnhancedAIAssistant:
                     'daily_change_pct': ((float(latest['c']) - float(prev['c'])) / float(prev['c'])) * 100,
                     'weekly_change_pct': ((float(latest['c']) - float(week_ago['c'])) / float(week_ago['c'])) * 100,
                     'volume': int(latest['v']),
-                    'avg_volume': sum(int(bar['v']) for bar in bars) / len(bars),
+                    'avg_volume': sum([int(bar['v']) for bar in bars]) / len(bars),
                     'high_period': max(float(bar['h']) for bar in bars),
                     'low_period': min(float(bar['l']) for bar in bars)
                 }
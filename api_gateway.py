@@ -12,6 +12,9 @@ from config import *
 
 logger = logging.getLogger(__name__)
 
+# Alpaca caps multi-symbol data requests at 100 symbols
+QUOTES_BULK_CHUNK_SIZE = 100
+
 @dataclass
 class ApiResponse:
     """Standardized API response wrapper"""
@@ -483,7 +486,59 @@ class ResilientAlpacaGateway:
         except Exception as e:
             logger.error(f"Bars request error for {symbol}: {e}")
             return []
-            
+
+    async def get_bars_bulk(self, symbols: List[str], timeframe: str = '1Day', limit: int = 60,
+                            start: datetime = None) -> Dict[str, List[Dict]]:
+        """
+        Get historical bars for many symbols using the multi-symbol endpoint
+        The endpoint's limit applies to the whole page, so a start date is derived from the
+        per-symbol limit (daily bars) and pages are followed until exhausted
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+
+        if start is None:
+            # ~1.5 calendar days per trading day plus a holiday cushion
+            start = datetime.now() - timedelta(days=int(limit * 1.5) + 10)
+
+        async def fetch_chunk(chunk: List[str]) -> Dict[str, List[Dict]]:
+            params = {
+                'symbols': ','.join(chunk),
+                'timeframe': timeframe,
+                'start': start.strftime('%Y-%m-%d'),
+                'limit': 10000,
+                'adjustment': 'raw'
+            }
+            chunk_bars = {}
+            while True:
+                response = await self._make_data_request('GET', '/v2/stocks/bars', params=params)
+                if not response.success:
+                    logger.warning(f"⚠️ Bulk bars request failed for {len(chunk)} symbols: {response.error}")
+                    break
+                for symbol, bars in (response.data.get('bars') or {}).items():
+                    chunk_bars.setdefault(symbol, []).extend(bars)
+                page_token = response.data.get('next_page_token')
+                if not page_token:
+                    break
+                params['page_token'] = page_token
+            return chunk_bars
+
+        chunks = [symbols[i:i + QUOTES_BULK_CHUNK_SIZE]
+                  for i in range(0, len(symbols), QUOTES_BULK_CHUNK_SIZE)]
+        results = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks), return_exceptions=True)
+
+        bars_by_symbol = {}
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Bulk bars request error: {result}")
+                continue
+            for symbol, bars in result.items():
+                bars_by_symbol[symbol] = bars[-limit:]
+
+        logger.debug(f"Bulk bars: {len(bars_by_symbol)}/{len(symbols)} symbols in {len(chunks)} requests")
+        return bars_by_symbol
+
     async def get_latest_quote(self, symbol: str):
         """Get latest quote for symbol"""
         try:
@@ -555,18 +610,7 @@ class ResilientAlpacaGateway:
                         except Exception as timestamp_error:
                             logger.debug(f"Could not validate timestamp for {symbol}: {timestamp_error}")
                     
-                    # Map Alpaca field names to our expected field names
-                    mapped_quote = {
-                        'bid_price': raw_quote.get('bp', 0),  # bp = bid price
-                        'bid_size': raw_quote.get('bs', 0),   # bs = bid size  
-                        'ask_price': raw_quote.get('ap', 0),  # ap = ask price
-                        'ask_size': raw_quote.get('as', 0),   # as = ask size
-                        'timestamp': raw_quote.get('t', ''),  # t = timestamp
-                        'condition': raw_quote.get('c', ''),  # c = condition
-                        'exchange': raw_quote.get('ax', ''),  # ax = ask exchange, bx = bid exchange
-                        'tape': raw_quote.get('z', '')        # z = tape
-                    }
-                    return mapped_quote
+                    return self._map_quote(raw_quote)
                 return None
             else:
                 # Handle expected failures more gracefully
@@ -586,6 +630,73 @@ class ResilientAlpacaGateway:
             logger.error(f"Quote request error for {symbol}: {e}")
             return None
             
+    async def get_quotes_bulk(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Get latest quotes for many symbols using the multi-symbol endpoint
+        Symbols are chunked into QUOTES_BULK_CHUNK_SIZE per request and the chunks fetched concurrently
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+
+        chunks = [symbols[i:i + QUOTES_BULK_CHUNK_SIZE]
+                  for i in range(0, len(symbols), QUOTES_BULK_CHUNK_SIZE)]
+        responses = await asyncio.gather(
+            *(self._make_data_request('GET', '/v2/stocks/quotes/latest', params={'symbols': ','.join(chunk)})
+              for chunk in chunks),
+            return_exceptions=True
+        )
+
+        # One market-status lookup for the whole batch instead of one per symbol
+        try:
+            from market_status_manager import MarketStatusManager
+            is_extended, _ = MarketStatusManager(None).is_extended_hours()
+        except Exception as e:
+            logger.debug(f"Market status check failed for bulk quotes: {e}")
+            is_extended = False
+        rejection_threshold = (API_CONFIG.get('extended_hours_rejection_minutes', 60) if is_extended
+                               else API_CONFIG.get('stale_data_rejection_minutes', 15))
+
+        quotes = {}
+        stale_symbols = []
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception) or not response.success:
+                error = response if isinstance(response, Exception) else response.error
+                logger.warning(f"⚠️ Bulk quote request failed for {len(chunk)} symbols: {error}")
+                continue
+
+            for symbol, raw_quote in (response.data.get('quotes') or {}).items():
+                quote_time = raw_quote.get('t')
+                if isinstance(quote_time, str):
+                    try:
+                        quote_timestamp = datetime.fromisoformat(quote_time.replace('Z', '+00:00'))
+                        age_minutes = (datetime.now(quote_timestamp.tzinfo) - quote_timestamp).total_seconds() / 60
+                        if age_minutes > rejection_threshold:
+                            stale_symbols.append(symbol)
+                            continue
+                    except ValueError as timestamp_error:
+                        logger.debug(f"Could not validate timestamp for {symbol}: {timestamp_error}")
+                quotes[symbol] = self._map_quote(raw_quote)
+
+        if stale_symbols:
+            logger.warning(f"⚠️ Rejected {len(stale_symbols)} stale quotes (>{rejection_threshold}m old)")
+        logger.debug(f"Bulk quotes: {len(quotes)}/{len(symbols)} symbols in {len(chunks)} requests")
+        return quotes
+
+    @staticmethod
+    def _map_quote(raw_quote: Dict) -> Dict:
+        """Map Alpaca field names to our expected field names"""
+        return {
+            'bid_price': raw_quote.get('bp', 0),  # bp = bid price
+            'bid_size': raw_quote.get('bs', 0),   # bs = bid size
+            'ask_price': raw_quote.get('ap', 0),  # ap = ask price
+            'ask_size': raw_quote.get('as', 0),   # as = ask size
+            'timestamp': raw_quote.get('t', ''),  # t = timestamp
+            'condition': raw_quote.get('c', ''),  # c = condition
+            'exchange': raw_quote.get('ax', ''),  # ax = ask exchange, bx = bid exchange
+            'tape': raw_quote.get('z', '')        # z = tape
+        }
+
     async def _make_data_request(self, method: str, endpoint: str, params: Dict = None) -> ApiResponse:
         """Make request to data API"""
         # Similar to _make_request but for data endpoints
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Pre-compile the Numba signal kernels so the first scan does not pay JIT compile time
+By default each @njit(cache=True) kernel is called once to warm the on-disk JIT cache (setup.sh does this).
+--aot instead builds the _trading_kernels extension module with numba.pycc, which is deprecated upstream
+and may be missing from newer numba releases; the JIT cache is warmed if it is unavailable
+"""
+
+import glob
+import os
+import sys
+
+import numpy as np
+
+AOT_MODULE_NAME = "_trading_kernels"
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Exported name -> (kernel attribute in enhanced_momentum_strategy, Numba signature)
+KERNEL_EXPORTS = {
+    'ewm_mean_rows': (
+        '_ewm_mean_rows',
+        'f8[:,::1](f8[:,::1], f8)'
+    ),
+    'enhanced_signal_kernel': (
+        '_enhanced_signal_kernel',
+        'Tuple((i8, i8, i8, b1, f8, f8, f8, b1, f8, f8, f8, f8, f8, f8))'
+        '(f8[::1], f8[::1], f8[::1], f8[::1], f8, b1, f8)'
+    ),
+    'simple_signal_kernel': (
+        '_simple_signal_kernel',
+        'Tuple((i8, f8, f8, i8, f8))(f8[::1], f8[::1], f8, i8, f8, i8)'
+    ),
+}
+
+def _remove_stale_builds():
+    """Delete previous builds so the strategy module imports its JIT kernels below"""
+    for path in glob.glob(os.path.join(PACKAGE_DIR, f"{AOT_MODULE_NAME}*.so")) + \
+                glob.glob(os.path.join(PACKAGE_DIR, f"{AOT_MODULE_NAME}*.pyd")):
+        os.remove(path)
+
+def compile_aot(strategy_module) -> bool:
+    """Compile all exported kernels into one extension module next to the sources"""
+    try:
+        from numba.pycc import CC
+    except ImportError:
+        print("⚠️ numba.pycc not available - skipping AOT build")
+        return False
+
+    cc = CC(AOT_MODULE_NAME)
+    cc.output_dir = PACKAGE_DIR
+    for export_name, (kernel_name, signature) in KERNEL_EXPORTS.items():
+        cc.export(export_name, signature)(getattr(strategy_module, kernel_name).py_func)
+
+    print(f"🔨 Compiling {len(KERNEL_EXPORTS)} kernels into {AOT_MODULE_NAME}...")
+    cc.compile()
+    print(f"✅ AOT kernels written to {PACKAGE_DIR}")
+    return True
+
+def warm_jit_cache(strategy_module):
+    """Call each kernel once so @njit(cache=True) writes its machine code to the Numba cache"""
+    prices = np.linspace(10.0, 12.0, 10)
+    volumes = np.full(10, 100000.0)
+
+    strategy_module._ewm_mean_rows(prices.reshape(1, -1), 12.0)
+    strategy_module._enhanced_signal_kernel(prices, prices * 1.01, prices * 0.99, volumes, 12.0, True, 0.01)
+    strategy_module._simple_signal_kernel(prices, volumes, 12.0, 100000, 11.8, 10)
+    cache_dir = os.environ.get('NUMBA_CACHE_DIR') or "__pycache__ next to the sources"
+    print(f"✅ JIT cache warmed in {cache_dir}")
+
+def main():
+    sys.path.insert(0, PACKAGE_DIR)
+    _remove_stale_builds()
+
+    import enhanced_momentum_strategy
+    from jit_utils import NUMBA_AVAILABLE
+
+    if not NUMBA_AVAILABLE:
+        print("⚠️ numba is not installed - kernels will run as plain Python")
+        return
+
+    if '--aot' in sys.argv[1:] and compile_aot(enhanced_momentum_strategy):
+        return
+    warm_jit_cache(enhanced_momentum_strategy)
+
+if __name__ == "__main__":
+    main()
@@ -82,6 +82,11 @@ FUNNEL_CONFIG = {
     # Step 3: Deep Dive (expanded for comprehensive analysis)
     'deep_dive_candidates': 100,       # Max stocks for deep analysis - increased significantly
     'deep_dive_api_budget': 20,        # API calls for detailed analysis
+    'deep_dive_concurrency': 10,       # Candidates analyzed concurrently during deep dive
+    'dynamic_discovery_concurrency': 20,  # Symbols probed concurrently by dynamic movers discovery
+    'comprehensive_scan_concurrency': 32,  # Symbol fetches in flight across all comprehensive scan batches
+    'bars_cache_ttl_seconds': 45,      # Discovery sources share supplemental bars fetched within this window
+    'sampling_seed': None,             # Seed for universe probe sampling (None = fresh entropy each run)
     'deep_dive_components': {
         'detailed_technicals': True,
         'news_analysis': True,
@@ -155,6 +160,7 @@ SCREENING_CRITERIA = {
 RATE_LIMIT_CONFIG = {
     'max_requests_per_minute': 200,
     'rate_limit_buffer': 0.85,         # Use 85% of limit
+    'enforce': False,                  # Funnel admission checks always allow (unlimited mode) unless True
     
     # API budget allocation
     'budget_allocation': {
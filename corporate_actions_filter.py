@@ -5,144 +5,374 @@ to prevent erroneous trading signals on affected stocks
 """
 
 import logging
-from typing import Dict, List, Set, Optional
+import sqlite3
+import sys
+from time import monotonic
+from typing import Dict, FrozenSet, List, Optional
 from datetime import datetime, timedelta
 import asyncio
 import aiohttp
 from config import *
+from supplemental_data_provider import SupplementalDataProvider
+
+try:
+    import orjson  # Optional: faster parsing of Alpha Vantage payloads
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# (low, high, ratio) bands of overnight price drop that match common split ratios
+SPLIT_DROP_BANDS = (
+    (0.45, 0.55, '2:1'),  # ~50% drop = 2:1 split
+    (0.62, 0.72, '3:1'),  # ~67% drop = 3:1 split
+    (0.74, 0.82, '4:1'),  # ~75% drop = 4:1 split
+)
+
+# Gaps above this are suspicious for mergers, spinoffs, etc. (lower than split bands)
+OVERNIGHT_GAP_THRESHOLD = 0.15
+
+def classify_split_ratio(yesterday_close: float, today_open: float) -> Optional[str]:
+    """Return the split ratio matching the overnight drop, or None (pure numeric, no I/O)"""
+    if yesterday_close <= 0 or today_open <= 0:
+        return None
+    price_drop_pct = (yesterday_close - today_open) / yesterday_close
+    for low, high, ratio in SPLIT_DROP_BANDS:
+        if low < price_drop_pct < high:
+            return ratio
+    return None
+
+def is_unusual_gap(yesterday_close: float, today_open: float) -> bool:
+    """True if the overnight gap exceeds OVERNIGHT_GAP_THRESHOLD (pure numeric, no I/O)"""
+    if yesterday_close <= 0 or today_open <= 0:
+        return False
+    return abs(today_open - yesterday_close) / yesterday_close > OVERNIGHT_GAP_THRESHOLD
+
 class CorporateActionsFilter:
     """
     Filter to detect and handle corporate actions that could affect trading
+    
+    Symbol strings are interned with sys.intern() as they enter the filter, so
+    blocked_symbols keys are shared, pre-hashed objects across repeated lookups.
     """
     
-    def __init__(self):
-        self.blocked_symbols = {}  # symbol -> block_until_timestamp
+    def __init__(self, cache_db_path: str = "corporate_actions_cache.db", data_provider=None):
+        self.blocked_symbols = {}  # symbol -> {'deadline_mono': float, 'human': datetime}
         self.corporate_actions_cache = {}  # Cache recent checks
         self.alpha_vantage_key = "demo"  # Will use demo key or get dynamic key
         
-    async def check_pre_market_corporate_actions(self, symbols: List[str]) -> Set[str]:
+        # Shared data provider (injected, or created lazily on first use)
+        self.data_provider = data_provider
+        self._owns_data_provider = data_provider is None
+        
+        # Durable cache so a restart before market open doesn't re-check every symbol
+        self._db = None
+        self._init_cache_db(cache_db_path)
+        
+        # Expired blocks are swept in the background, not on the pre-market check path
+        self._cleanup_task = None
+        self._cleanup_interval_seconds = 300
+        
+        # symbol -> Future for checks already in progress (singleflight)
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        
+        # Cap on the per-symbol worst case across concurrent probes
+        self._probe_timeout_seconds = 5
+        
+    async def initialize(self):
+        """Start the periodic expired-block cleanup task"""
+        if self._cleanup_task is None or self._cleanup_task.done():
+            self._cleanup_task = asyncio.create_task(self._periodic_cleanup())
+            
+    async def shutdown(self):
+        """Stop the background cleanup task and close the cache database"""
+        try:
+            if self._cleanup_task and not self._cleanup_task.done():
+                self._cleanup_task.cancel()
+                try:
+                    await self._cleanup_task
+                except asyncio.CancelledError:
+                    pass
+            self._cleanup_task = None
+            
+            if self._owns_data_provider and self.data_provider is not None:
+                await self.data_provider.shutdown()
+                self.data_provider = None
+            
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+        except Exception as e:
+            logger.warning(f"⚠️ Corporate actions filter shutdown warning: {e}")
+    
+    async def _periodic_cleanup(self):
+        """Sweep expired blocks and previous days' checks every few minutes"""
+        while True:
+            await asyncio.sleep(self._cleanup_interval_seconds)
+            self._cleanup_expired_blocks()
+            self._purge_stale_checks()
+        
+    def _init_cache_db(self, cache_db_path: str):
+        """Open the SQLite cache and rehydrate active blocks and today's checks"""
+        try:
+            self._db = sqlite3.connect(cache_db_path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS blocks(symbol TEXT PRIMARY KEY, blocked_until REAL)")
+            
+            # Checks are only valid for the day they ran; older cache files lack check_date, so rebuild them
+            check_columns = {row[1] for row in self._db.execute("PRAGMA table_info(checks)")}
+            if check_columns and 'check_date' not in check_columns:
+                self._db.execute("DROP TABLE checks")
+            self._db.execute("CREATE TABLE IF NOT EXISTS checks(cache_key TEXT PRIMARY KEY, check_date TEXT, "
+                             "block INTEGER, checked_at REAL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS checks_by_date ON checks(check_date)")
+            
+            today = str(datetime.now().date())
+            self._db.execute("DELETE FROM checks WHERE check_date < ?", (today,))
+            self._db.execute("DELETE FROM blocks WHERE blocked_until <= ?", (datetime.now().timestamp(),))
+            self._db.commit()
+            
+            # blocked_until is wall-clock epoch on disk; convert to monotonic deadlines in memory
+            now_wall = datetime.now().timestamp()
+            now_mono = monotonic()
+            rows = self._db.execute(
+                "SELECT symbol, blocked_until FROM blocks WHERE blocked_until > ?", (now_wall,)
+            ).fetchall()
+            for symbol, blocked_until in rows:
+                self.blocked_symbols[sys.intern(symbol)] = {
+                    'deadline_mono': now_mono + (blocked_until - now_wall),
+                    'human': datetime.fromtimestamp(blocked_until)
+                }
+            
+            for cache_key, block, checked_at in self._db.execute(
+                "SELECT cache_key, block, checked_at FROM checks WHERE check_date = ?", (today,)
+            ):
+                self.corporate_actions_cache[cache_key] = {
+                    'block': bool(block),
+                    'checked_at': datetime.fromtimestamp(checked_at)
+                }
+            
+            if rows or self.corporate_actions_cache:
+                logger.info(f"📂 Corporate actions cache restored: {len(rows)} blocks, "
+                            f"{len(self.corporate_actions_cache)} checks from today")
+                
+        except Exception as e:
+            logger.warning(f"⚠️ Corporate actions cache unavailable, using memory only: {e}")
+            self._db = None
+    
+    def _persist(self, sql: str, params: tuple, commit: bool = True):
+        """Write-through to the SQLite cache (best effort); commit=False leaves it to _commit_cache"""
+        if self._db is None:
+            return
+        try:
+            self._db.execute(sql, params)
+            if commit:
+                self._db.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to persist corporate actions cache: {e}")
+    
+    def _commit_cache(self):
+        """Commit writes batched with _persist(commit=False)"""
+        if self._db is None:
+            return
+        try:
+            self._db.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to commit corporate actions cache: {e}")
+    
+    def _purge_stale_checks(self):
+        """Drop checks from previous days from memory and the cache database"""
+        try:
+            today = str(datetime.now().date())
+            today_suffix = f"_{today}"
+            stale_keys = [key for key in self.corporate_actions_cache if not key.endswith(today_suffix)]
+            for key in stale_keys:
+                del self.corporate_actions_cache[key]
+            self._persist("DELETE FROM checks WHERE check_date < ?", (today,))
+        except Exception as e:
+            logger.error(f"Error purging stale corporate action checks: {e}")
+        
+    async def check_pre_market_corporate_actions(self, symbols: List[str]) -> FrozenSet[str]:
         """
         Check for corporate actions before market opens
-        Returns set of symbols to temporarily block from trading
+        Returns frozenset of symbols to temporarily block from trading
         """
         try:
             logger.info(f"🔍 Checking corporate actions for {len(symbols)} symbols")
+            symbols = [sys.intern(s) for s in symbols]
             
-            blocked_symbols = set()
+            # Symbols already under an active block need no API calls
+            blocked_symbols = {s for s in symbols if self.is_symbol_blocked(s)}
+            symbols = [s for s in symbols if s not in blocked_symbols]
             
-            # Check each symbol for corporate actions
-            for symbol in symbols:
-                try:
-                    # Check cache first
-                    cache_key = f"{symbol}_{datetime.now().date()}"
-                    if cache_key in self.corporate_actions_cache:
-                        logger.debug(f"Using cached corporate actions data for {symbol}")
-                        cached_data = self.corporate_actions_cache[cache_key]
-                        if cached_data.get('block', False):
+            # Check each symbol for corporate actions (cache writes are committed once after the loop)
+            try:
+                for symbol in symbols:
+                    try:
+                        # Check cache first
+                        check_date = str(datetime.now().date())
+                        cache_key = f"{symbol}_{check_date}"
+                        if cache_key in self.corporate_actions_cache:
+                            logger.debug(f"Using cached corporate actions data for {symbol}")
+                            cached_data = self.corporate_actions_cache[cache_key]
+                            if cached_data.get('block', False):
+                                blocked_symbols.add(symbol)
+                            continue
+                        
+                        # Check for corporate actions (shared with any concurrent caller)
+                        has_corporate_action = await self._check_symbol_singleflight(symbol)
+                        
+                        # Cache the result
+                        checked_at = datetime.now()
+                        self.corporate_actions_cache[cache_key] = {
+                            'block': has_corporate_action,
+                            'checked_at': checked_at
+                        }
+                        self._persist(
+                            "INSERT OR REPLACE INTO checks(cache_key, check_date, block, checked_at) VALUES (?, ?, ?, ?)",
+                            (cache_key, check_date, int(has_corporate_action), checked_at.timestamp()),
+                            commit=False
+                        )
+                        
+                        if has_corporate_action:
                             blocked_symbols.add(symbol)
+                            # Block for 3 days to allow indicators to normalize
+                            block_until = self._block_symbol(symbol, days=3, commit=False)
+                            logger.warning(f"🚫 {symbol} blocked due to corporate action until {block_until.date()}")
+                        
+                        # Rate limiting - don't overwhelm APIs
+                        await asyncio.sleep(0.5)
+                        
+                    except Exception as e:
+                        logger.error(f"Error checking corporate actions for {symbol}: {e}")
                         continue
-                    
-                    # Check for corporate actions
-                    has_corporate_action = await self._check_symbol_corporate_actions(symbol)
-                    
-                    # Cache the result
-                    self.corporate_actions_cache[cache_key] = {
-                        'block': has_corporate_action,
-                        'checked_at': datetime.now()
-                    }
-                    
-                    if has_corporate_action:
-                        blocked_symbols.add(symbol)
-                        # Block for 3 days to allow indicators to normalize
-                        block_until = datetime.now() + timedelta(days=3)
-                        self.blocked_symbols[symbol] = block_until
-                        logger.warning(f"🚫 {symbol} blocked due to corporate action until {block_until.date()}")
-                    
-                    # Rate limiting - don't overwhelm APIs
-                    await asyncio.sleep(0.5)
-                    
-                except Exception as e:
-                    logger.error(f"Error checking corporate actions for {symbol}: {e}")
-                    continue
-            
-            # Clean up old blocked symbols
-            self._cleanup_expired_blocks()
+            finally:
+                self._commit_cache()
             
             if blocked_symbols:
                 logger.warning(f"🚫 Corporate actions detected - blocking {len(blocked_symbols)} symbols: {blocked_symbols}")
             else:
                 logger.info("✅ No corporate actions detected for current watchlist")
             
-            return blocked_symbols
+            return frozenset(blocked_symbols)
             
         except Exception as e:
             logger.error(f"Corporate actions check failed: {e}")
-            return set()  # Return empty set on error - don't block trading
+            return frozenset()  # Return empty set on error - don't block trading
+    
+    async def _check_symbol_singleflight(self, symbol: str) -> bool:
+        """
+        Run _check_symbol_corporate_actions once per symbol at a time
+        Concurrent callers for the same symbol await the first caller's result
+        """
+        in_flight = self._in_flight.get(symbol)
+        if in_flight is not None:
+            return await in_flight
+        
+        fut = asyncio.get_running_loop().create_future()
+        self._in_flight[symbol] = fut
+        try:
+            result = await self._check_symbol_corporate_actions(symbol)
+            fut.set_result(result)
+            return result
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                fut.cancel()
+            else:
+                fut.set_exception(e)
+            raise
+        finally:
+            del self._in_flight[symbol]
     
     async def _check_symbol_corporate_actions(self, symbol: str) -> bool:
         """
         Check individual symbol for corporate actions using multiple methods
+        The price-history probe and Alpha Vantage probe are independent and run concurrently
         """
         try:
-            # Method 1: Check recent price movements for split indicators
-            split_detected = await self._detect_potential_split(symbol)
-            if split_detected:
-                logger.warning(f"🚫 {symbol} potential stock split detected")
+            # Already blocked - skip all network I/O
+            if self.is_symbol_blocked(symbol):
                 return True
             
+            # Methods 1 + 3: split and overnight gap share the same bars
+            price_task = asyncio.create_task(self._fetch_and_classify(symbol))
             # Method 2: Alpha Vantage corporate actions (if available)
-            if await self._has_alpha_vantage_access():
-                corporate_action = await self._check_alpha_vantage_corporate_actions(symbol)
-                if corporate_action:
-                    logger.warning(f"🚫 {symbol} corporate action from Alpha Vantage: {corporate_action}")
-                    return True
+            av_task = asyncio.create_task(self._check_alpha_vantage_if_available(symbol))
             
-            # Method 3: Check for unusual overnight price gaps
-            gap_detected = await self._detect_overnight_gap(symbol)
-            if gap_detected:
-                logger.warning(f"🚫 {symbol} unusual overnight gap detected")
-                return True
+            try:
+                results = await asyncio.wait_for(
+                    asyncio.gather(price_task, av_task),
+                    timeout=self._probe_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"⏱️ Corporate actions probes timed out for {symbol}")
+                return False  # Don't block on timeout
             
-            return False
+            return any(results)
             
         except Exception as e:
             logger.error(f"Error checking corporate actions for {symbol}: {e}")
             return False  # Don't block on error
     
-    async def _detect_potential_split(self, symbol: str) -> bool:
+    async def _get_data_provider(self):
+        """Return the shared data provider, creating and initializing it on first use"""
+        if self.data_provider is None:
+            self.data_provider = SupplementalDataProvider()
+        if self.data_provider.session is None:
+            await self.data_provider.initialize()
+        return self.data_provider
+    
+    async def _fetch_and_classify(self, symbol: str) -> bool:
         """
-        Detect potential stock splits by examining recent price history
+        Fetch recent bars once and run both split and overnight gap detection on them
         """
         try:
-            # Import here to avoid circular imports
-            from supplemental_data_provider import SupplementalDataProvider
+            data_provider = await self._get_data_provider()
+            
+            # Only the last 2 bars are needed to check for splits and gaps
+            recent_bars = await data_provider.get_last_n_bars(symbol, 2)
             
-            # Create data provider instance
-            data_provider = SupplementalDataProvider()
+            if self._detect_potential_split(symbol, recent_bars):
+                logger.warning(f"🚫 {symbol} potential stock split detected")
+                return True
+            
+            if self._detect_overnight_gap(symbol, recent_bars):
+                logger.warning(f"🚫 {symbol} unusual overnight gap detected")
+                return True
             
-            # Get last 2 days of data to check for split patterns
-            recent_bars = await data_provider.get_historical_data(symbol, days=2, min_bars=2)
+            return False
             
+        except Exception as e:
+            logger.error(f"Error fetching price history for {symbol}: {e}")
+            return False
+    
+    async def _check_alpha_vantage_if_available(self, symbol: str) -> bool:
+        """Run the Alpha Vantage corporate actions probe when access is configured"""
+        if not await self._has_alpha_vantage_access():
+            return False
+        
+        corporate_action = await self._check_alpha_vantage_corporate_actions(symbol)
+        if corporate_action:
+            logger.warning(f"🚫 {symbol} corporate action from Alpha Vantage: {corporate_action}")
+            return True
+        return False
+    
+    def _detect_potential_split(self, symbol: str, recent_bars: List[Dict]) -> bool:
+        """
+        Detect potential stock splits by examining recent price history
+        """
+        try:
             if recent_bars and len(recent_bars) >= 2:
                 yesterday_close = float(recent_bars[-2]['c'])
                 today_open = float(recent_bars[-1]['o'])
                 
-                if yesterday_close > 0 and today_open > 0:
+                ratio = classify_split_ratio(yesterday_close, today_open)
+                if ratio:
                     price_drop_pct = (yesterday_close - today_open) / yesterday_close
-                    
-                    # Check for common split ratios
-                    if 0.45 < price_drop_pct < 0.55:  # ~50% drop = 2:1 split
-                        logger.warning(f"🚫 {symbol}: Potential 2:1 stock split detected ({price_drop_pct:.1%} drop)")
-                        return True
-                    elif 0.62 < price_drop_pct < 0.72:  # ~67% drop = 3:1 split  
-                        logger.warning(f"🚫 {symbol}: Potential 3:1 stock split detected ({price_drop_pct:.1%} drop)")
-                        return True
-                    elif 0.74 < price_drop_pct < 0.82:  # ~75% drop = 4:1 split
-                        logger.warning(f"🚫 {symbol}: Potential 4:1 stock split detected ({price_drop_pct:.1%} drop)")
-                        return True
+                    logger.warning(f"🚫 {symbol}: Potential {ratio} stock split detected ({price_drop_pct:.1%} drop)")
+                    return True
             
             return False
             
@@ -178,7 +408,7 @@ class CorporateActionsFilter:
             
             # async with aiohttp.ClientSession() as session:
             #     async with session.get(url, params=params) as response:
-            #         data = await response.json()
+            #         data = _json_loads(await response.read())
             #         
             #         if 'Corporate Actions' in data:
             #             # Check for recent actions
@@ -194,32 +424,19 @@ class CorporateActionsFilter:
             logger.error(f"Error checking Alpha Vantage corporate actions for {symbol}: {e}")
             return None
     
-    async def _detect_overnight_gap(self, symbol: str) -> bool:
+    def _detect_overnight_gap(self, symbol: str, recent_bars: List[Dict]) -> bool:
         """
         Detect unusual overnight price gaps that might indicate corporate actions
         """
         try:
-            # Import here to avoid circular imports
-            from supplemental_data_provider import SupplementalDataProvider
-            
-            # Create data provider instance  
-            data_provider = SupplementalDataProvider()
-            
-            # Get last 2 days of data to check for unusual gaps
-            recent_bars = await data_provider.get_historical_data(symbol, days=2, min_bars=2)
-            
             if recent_bars and len(recent_bars) >= 2:
                 yesterday_close = float(recent_bars[-2]['c'])
                 today_open = float(recent_bars[-1]['o'])
                 
-                if yesterday_close > 0 and today_open > 0:
+                if is_unusual_gap(yesterday_close, today_open):
                     gap_pct = abs(today_open - yesterday_close) / yesterday_close
-                    
-                    # Flag gaps > 15% as potentially suspicious for corporate actions
-                    # (Lower threshold than splits since gaps can indicate mergers, spinoffs, etc.)
-                    if gap_pct > 0.15:
-                        logger.warning(f"🚫 {symbol}: Unusual overnight gap detected ({gap_pct:.1%})")
-                        return True
+                    logger.warning(f"🚫 {symbol}: Unusual overnight gap detected ({gap_pct:.1%})")
+                    return True
             
             return False
             
@@ -227,17 +444,37 @@ class CorporateActionsFilter:
             logger.error(f"Error detecting overnight gap for {symbol}: {e}")
             return False
     
+    def _block_symbol(self, symbol: str, days: int = 3, commit: bool = True) -> datetime:
+        """
+        Block a symbol for the given number of days.
+        Comparisons use a monotonic deadline; the datetime is kept for logs/reporting only.
+        """
+        symbol = sys.intern(symbol)
+        block_until = datetime.now() + timedelta(days=days)
+        self.blocked_symbols[symbol] = {
+            'deadline_mono': monotonic() + days * 86400,
+            'human': block_until
+        }
+        self._persist(
+            "INSERT OR REPLACE INTO blocks(symbol, blocked_until) VALUES (?, ?)",
+            (symbol, block_until.timestamp()),
+            commit=commit
+        )
+        return block_until
+    
     def is_symbol_blocked(self, symbol: str) -> bool:
         """
         Check if a symbol is currently blocked due to corporate actions
         """
-        if symbol not in self.blocked_symbols:
+        symbol = sys.intern(symbol)
+        entry = self.blocked_symbols.get(symbol)
+        if entry is None:
             return False
         
-        block_until = self.blocked_symbols[symbol]
-        if datetime.now() > block_until:
+        if monotonic() > entry['deadline_mono']:
             # Block has expired
             del self.blocked_symbols[symbol]
+            self._persist("DELETE FROM blocks WHERE symbol = ?", (symbol,))
             logger.info(f"✅ {symbol} corporate action block expired")
             return False
         
@@ -247,14 +484,15 @@ class CorporateActionsFilter:
         """Clean up expired symbol blocks"""
         try:
             expired_symbols = []
-            now = datetime.now()
+            now = monotonic()
             
-            for symbol, block_until in self.blocked_symbols.items():
-                if now > block_until:
+            for symbol, entry in self.blocked_symbols.items():
+                if now > entry['deadline_mono']:
                     expired_symbols.append(symbol)
             
             for symbol in expired_symbols:
                 del self.blocked_symbols[symbol]
+                self._persist("DELETE FROM blocks WHERE symbol = ?", (symbol,))
                 logger.info(f"✅ {symbol} corporate action block expired and removed")
                 
         except Exception as e:
@@ -262,14 +500,15 @@ class CorporateActionsFilter:
     
     def get_blocked_symbols_info(self) -> Dict:
         """Get information about currently blocked symbols"""
+        now = monotonic()
         return {
             'blocked_symbols': list(self.blocked_symbols.keys()),
             'block_details': {
                 symbol: {
-                    'blocked_until': block_until.isoformat(),
-                    'days_remaining': (block_until - datetime.now()).days
+                    'blocked_until': entry['human'].isoformat(),
+                    'days_remaining': int((entry['deadline_mono'] - now) // 86400)
                 }
-                for symbol, block_until in self.blocked_symbols.items()
+                for symbol, entry in self.blocked_symbols.items()
             },
             'total_blocked': len(self.blocked_symbols)
         }
@@ -277,8 +516,10 @@ class CorporateActionsFilter:
     async def force_unblock_symbol(self, symbol: str) -> bool:
         """Force unblock a symbol (for manual intervention)"""
         try:
+            symbol = sys.intern(symbol)
             if symbol in self.blocked_symbols:
                 del self.blocked_symbols[symbol]
+                self._persist("DELETE FROM blocks WHERE symbol = ?", (symbol,))
                 logger.info(f"🔓 {symbol} manually unblocked")
                 return True
             else:
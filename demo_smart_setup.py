@@ -75,11 +75,16 @@ async def demo_smart_setup():
             print(f"   New initial value: ${tracker.initial_value:,.2f}")
             
             # Show updated performance calculation
+            # Daily summary and positions are independent reads - fetch them concurrently
             print("\n📈 Updated Performance Calculation:")
-            daily_summary = await tracker.get_daily_summary()
+            daily_summary, positions_summary = await asyncio.gather(
+                tracker.get_daily_summary(),
+                tracker.get_positions_summary()
+            )
             print(f"   Current Equity: ${daily_summary.get('current_equity', 0):,.2f}")
             print(f"   Total P&L: ${daily_summary.get('total_pnl', 0):+.2f}")
             print(f"   Total P&L %: {daily_summary.get('total_pnl_pct', 0):+.2f}%")
+            print(f"   Open Positions: {positions_summary.get('total_positions', 0)}")
             
             # Verify the calculation makes sense
             expected_pnl = daily_summary.get('current_equity', 0) - tracker.initial_value
@@ -4,13 +4,24 @@ Monitors and protects positions during extended hours trading
 """
 
 import logging
+import sys
+from bisect import bisect_right
 from datetime import datetime, time, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# dataclass(slots=True) needs Python 3.10+
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# |gap %| thresholds and the risk level for each bin (a gap exactly on a threshold falls in the higher bin)
+_RISK_BINS = (2.0, 5.0, 10.0)
+_RISK_LABELS = ('LOW', 'MODERATE', 'HIGH', 'EXTREME')
+
+@dataclass(**_DATACLASS_SLOTS)
 class GapRiskAlert:
     """Gap risk alert for extended hours moves"""
     symbol: str
@@ -29,18 +40,26 @@ class GapRiskManager:
     
     def __init__(self):
         self.position_closes = {}  # Track closing prices for gap calculation
-        self.gap_alerts_sent = set()  # Prevent duplicate alerts
+        # Prevent duplicate alerts: bit (symbol index * 4 + risk level index) set once alerted
+        self._alert_bits = 0
         self.last_reset_date = datetime.now().date()
+        # Quantities and close prices of position_closes as parallel arrays (same order as the dict)
+        self._symbol_idx: Dict[str, int] = {}
+        self._qty_arr = np.empty(0, dtype=np.float64)
+        self._close_arr = np.empty(0, dtype=np.float64)
         
     def record_market_close_positions(self, positions: List) -> None:
         """Record position prices at market close for gap calculation"""
         try:
-            current_date = datetime.now().date()
+            # One clock read per call, shared by every recorded position
+            now = datetime.now()
+            current_date = now.date()
+            close_time = now
             
             # Reset daily tracking
             if current_date != self.last_reset_date:
                 self.position_closes.clear()
-                self.gap_alerts_sent.clear()
+                self._alert_bits = 0
                 self.last_reset_date = current_date
             
             for position in positions:
@@ -51,15 +70,24 @@ class GapRiskManager:
                     self.position_closes[symbol] = {
                         'close_price': close_price,
                         'quantity': float(position.qty),
-                        'close_time': datetime.now()
+                        'close_time': close_time
                     }
             
+            self._rebuild_position_arrays()
+            
             if self.position_closes:
                 logger.info(f"📊 Recorded {len(self.position_closes)} position closes for gap risk monitoring")
                 
         except Exception as e:
             logger.error(f"Failed to record market close positions: {e}")
     
+    def _rebuild_position_arrays(self) -> None:
+        """Refresh the parallel quantity/close arrays from position_closes"""
+        closes = self.position_closes.values()
+        self._symbol_idx = {symbol: idx for idx, symbol in enumerate(self.position_closes)}
+        self._qty_arr = np.fromiter((pos_data['quantity'] for pos_data in closes), dtype=np.float64, count=len(closes))
+        self._close_arr = np.fromiter((pos_data['close_price'] for pos_data in closes), dtype=np.float64, count=len(closes))
+    
     def calculate_gap_risk(self, symbol: str, current_price: float) -> Optional[GapRiskAlert]:
         """Calculate gap risk for a position"""
         try:
@@ -77,14 +105,7 @@ class GapRiskManager:
             position_impact = (current_price - close_price) * abs(quantity)
             
             # Determine risk level
-            if abs(gap_percent) >= 10:
-                risk_level = "EXTREME"
-            elif abs(gap_percent) >= 5:
-                risk_level = "HIGH"  
-            elif abs(gap_percent) >= 2:
-                risk_level = "MODERATE"
-            else:
-                risk_level = "LOW"
+            risk_level = _RISK_LABELS[bisect_right(_RISK_BINS, abs(gap_percent))]
             
             return GapRiskAlert(
                 symbol=symbol,
@@ -100,6 +121,44 @@ class GapRiskManager:
             logger.error(f"Gap risk calculation failed for {symbol}: {e}")
             return None
     
+    def calculate_gap_risks_batch(self, symbols: List[str], prices) -> List[GapRiskAlert]:
+        """
+        Vectorized calculate_gap_risk for many symbols at once
+        Only returns alerts for gaps of 2% or more (the alerting threshold); unknown symbols are skipped
+        """
+        try:
+            prices = np.asarray(prices, dtype=np.float64)
+            known = [row for row, symbol in enumerate(symbols) if symbol in self._symbol_idx]
+            if not known:
+                return []
+            
+            idx = np.fromiter((self._symbol_idx[symbols[row]] for row in known), dtype=np.intp, count=len(known))
+            current_prices = prices[known]
+            close_prices = self._close_arr[idx]
+            quantities = self._qty_arr[idx]
+            
+            gap_percents = ((current_prices - close_prices) / close_prices) * 100
+            position_impacts = (current_prices - close_prices) * np.abs(quantities)
+            risk_idx = np.searchsorted(_RISK_BINS, np.abs(gap_percents), side='right')
+            
+            timestamp = datetime.now()
+            return [
+                GapRiskAlert(
+                    symbol=symbols[known[i]],
+                    gap_percent=float(gap_percents[i]),
+                    current_price=float(current_prices[i]),
+                    previous_close=float(close_prices[i]),
+                    position_impact=float(position_impacts[i]),
+                    risk_level=_RISK_LABELS[risk_idx[i]],
+                    timestamp=timestamp
+                )
+                for i in np.flatnonzero(risk_idx > 0)
+            ]
+            
+        except Exception as e:
+            logger.error(f"Batch gap risk calculation failed: {e}")
+            return []
+    
     def should_alert_gap_risk(self, alert: GapRiskAlert) -> bool:
         """Determine if gap risk alert should be sent"""
         try:
@@ -107,23 +166,31 @@ class GapRiskManager:
             if abs(alert.gap_percent) < 2:
                 return False
             
-            # Prevent duplicate alerts for same symbol
-            alert_key = f"{alert.symbol}_{alert.risk_level}"
-            if alert_key in self.gap_alerts_sent:
+            symbol_idx = self._symbol_idx.get(alert.symbol)
+            if symbol_idx is None:
+                return False  # No recorded close for this symbol
+            
+            # Prevent duplicate alerts for same symbol and risk level
+            alert_bit = 1 << (symbol_idx * len(_RISK_LABELS) + _RISK_LABELS.index(alert.risk_level))
+            if self._alert_bits & alert_bit:
                 return False
             
-            self.gap_alerts_sent.add(alert_key)
+            self._alert_bits |= alert_bit
             return True
             
         except Exception as e:
             logger.error(f"Gap alert decision failed: {e}")
             return False
     
+    def alerts_sent_count(self) -> int:
+        """Number of (symbol, risk level) alerts sent since the last reset"""
+        return bin(self._alert_bits).count('1')
+    
     def reset_alert_tracking(self):
         """Reset alert tracking for new trading session"""
         try:
-            alerts_cleared = len(self.gap_alerts_sent)
-            self.gap_alerts_sent.clear()
+            alerts_cleared = self.alerts_sent_count()
+            self._alert_bits = 0
             if alerts_cleared > 0:
                 logger.info(f"🔄 Reset {alerts_cleared} gap risk alert suppressions for new trading session")
         except Exception as e:
@@ -143,15 +210,9 @@ class GapRiskManager:
                 }
             
             # Calculate exposure metrics
-            total_exposure = sum(
-                abs(pos_data['quantity']) * pos_data['close_price'] 
-                for pos_data in self.position_closes.values()
-            )
-            
-            max_position_value = max(
-                abs(pos_data['quantity']) * pos_data['close_price']
-                for pos_data in self.position_closes.values()
-            )
+            exposures = np.abs(self._qty_arr) * self._close_arr
+            total_exposure = float(exposures.sum())
+            max_position_value = float(exposures.max())
             
             # Determine overall risk level
             if total_positions >= 5:
@@ -184,7 +245,7 @@ class GapRiskManager:
                 'positions_monitored': list(self.position_closes.keys()),
                 'total_exposure': exposure.get('total_market_exposure', 0),
                 'risk_assessment': exposure.get('risk_level', 'UNKNOWN'),
-                'alerts_sent_today': len(self.gap_alerts_sent),
+                'alerts_sent_today': self.alerts_sent_count(),
                 'recommendations': []
             }
             
@@ -6,19 +6,223 @@ Enhanced with Tiered Analysis System for comprehensive coverage
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Tuple, Set
+import sys
+import aiohttp
+from typing import Callable, Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import lru_cache
+from time import monotonic
 import pandas as pd
 import numpy as np
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque
+import heapq
 import json
+import re
+from operator import attrgetter, itemgetter
 from config import *
+from jit_utils import njit
 from tiered_analyzer import TieredAnalyzer, AnalysisResult, AnalysisTier
+from supplemental_data_provider import SupplementalDataProvider
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep the regular __dict__ layout
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Crypto and forex tickers are skipped wherever these appear anywhere in the symbol
+_CRYPTO_PATTERNS = ('USD', 'BTC', 'ETH', 'USDT', 'EUR', 'GBP', 'JPY', 'CRYPTO', 'COIN')
+_CRYPTO_RE = re.compile('|'.join(_CRYPTO_PATTERNS))
+
+# Common invalid/problematic symbols, and substrings that mark share classes or test listings
+_INVALID_SYMBOLS = frozenset({'NDTAF', 'BRK.A', 'BRK.B'})
+_INVALID_SYMBOL_RE = re.compile(r'\.A|\.B|TEST|TEMP')
+
+# Both rejection rules in one pass: crypto/forex substrings (any case), then invalid markers and tickers
+_REJECTED_SYMBOL_RE = re.compile(
+    r'(?i:' + _CRYPTO_RE.pattern + r')|' + _INVALID_SYMBOL_RE.pattern + '|'
+    + '|'.join(r'\A' + re.escape(symbol) + r'\Z' for symbol in sorted(_INVALID_SYMBOLS))
+)
+
+def _is_rejected_symbol(symbol: str) -> bool:
+    """True for empty or over-long symbols and crypto/forex, share-class or test listings"""
+    return not 1 <= len(symbol) <= 5 or _REJECTED_SYMBOL_RE.search(symbol) is not None
+
+# Preliminary score contribution (0-0.2) by discovery source
+_SOURCE_SCORES = {
+    'market_gainers': 0.2,
+    'news_movers': 0.18,
+    'unusual_volume': 0.15,
+    'most_active': 0.12,
+    'market_losers': 0.1
+}
+
+# High-priced names skipped for small accounts that cannot size positions in them
+_EXPENSIVE_STOCKS = frozenset({'GOOGL', 'GOOG', 'AMZN', 'TSLA', 'BRK.A', 'BRK.B', 'NVDA', 'META'})
+
+# Major exchanges sampled by dynamic movers discovery
+_LIQUID_EXCHANGES = frozenset({'NYSE', 'NASDAQ', 'NYSEARCA'})
+
+# Named asset universe filters: name -> predicate(symbol, exchange), evaluated once per universe refresh
+_UNIVERSE_FILTERS = {
+    # Plain-alpha major-exchange symbols (dynamic movers)
+    'liquid': lambda symbol, exchange: exchange in _LIQUID_EXCHANGES and len(symbol) <= 4 and symbol.isalpha(),
+    # Comprehensive scan: plain-alpha, no warrants/units/rights
+    'quality': lambda symbol, exchange: (exchange in _LIQUID_EXCHANGES and len(symbol) <= 5 and symbol.isalpha()
+                                         and not any(bad in symbol for bad in ('WARR', 'UNIT', 'RIGHT'))),
+    # Short major-exchange symbols (volume discovery)
+    'short': lambda symbol, exchange: exchange in _LIQUID_EXCHANGES and len(symbol) <= 4,
+    # NYSE/NASDAQ listings only, no ETFs (simulated movers)
+    'listed': lambda symbol, exchange: exchange in ('NYSE', 'NASDAQ') and len(symbol) <= 4 and symbol.isalpha(),
+}
+
+# Ranking key for opportunity lists
+_BY_OPPORTUNITY_SCORE = attrgetter('opportunity_score')
+
+# Field access for supplemental/Alpaca bars, which always carry 'c' and 'v'
+_BAR_CLOSE_VOLUME = itemgetter('c', 'v')
+_BAR_VOLUME = itemgetter('v')
+
+# Preferred discovery source when the same symbol is found by several scans (lower wins)
+_DISCOVERY_SOURCE_PRIORITY = {
+    'market_gainers': 1,
+    'unusual_volume': 2,
+    'news_movers': 3,
+    'most_active': 4,
+    'market_losers': 5
+}
+
+# Tradeable universe symbol (matched against the upper-cased symbol): 1-5 characters of
+# letters, digits, '.' or '-' with at least one alphanumeric, and no crypto/forex pattern
+_TRADEABLE_SYMBOL_RE = re.compile(
+    r'(?!.*(?:' + _CRYPTO_RE.pattern + r'))(?=.*[A-Z0-9])[A-Z0-9.\-]{1,5}'
+)
+
+# Symbol classification tables used by _estimate_market_cap_for / _sector_for
+_MARKET_CAP_ETFS = frozenset({'SPY', 'QQQ', 'IWM', 'XLF', 'XLK', 'XLE', 'XLV', 'XLI', 'XLP', 'XLY', 'XLU', 'XLB', 'XLRE'})
+_LARGE_CAP_TECH = frozenset({'AAPL', 'MSFT', 'GOOGL', 'GOOG', 'AMZN'})
+_MAJOR_TECH = frozenset({'NVDA', 'META', 'TSLA', 'NFLX', 'CRM', 'ADBE', 'ORCL', 'INTC', 'AMD', 'QCOM'})
+
+_BROAD_ETFS = frozenset({'SPY', 'QQQ', 'IWM', 'DIA', 'VTI', 'VOO'})
+_SECTOR_ETFS = {
+    'XLK': 'TECHNOLOGY_ETF',
+    'XLF': 'FINANCIALS_ETF', 
+    'XLE': 'ENERGY_ETF',
+    'XLV': 'HEALTHCARE_ETF',
+    'XLI': 'INDUSTRIALS_ETF',
+    'XLP': 'CONSUMER_STAPLES_ETF',
+    'XLY': 'CONSUMER_DISCRETIONARY_ETF',
+    'XLU': 'UTILITIES_ETF',
+    'XLB': 'MATERIALS_ETF',
+    'XLRE': 'REAL_ESTATE_ETF'
+}
+_SECTOR_COMPANIES = (
+    ('TECHNOLOGY', frozenset({'AAPL', 'MSFT', 'GOOGL', 'GOOG', 'AMZN', 'META', 'NVDA', 'AMD', 'INTC', 
+                              'CRM', 'ORCL', 'ADBE', 'NFLX', 'ROKU', 'ZM', 'SNAP', 'TWTR', 'SQ', 'PYPL'})),
+    ('AUTOMOTIVE', frozenset({'TSLA', 'F', 'GM', 'NIO', 'XPEV', 'LI', 'RIVN', 'LCID'})),
+    ('FINANCIALS', frozenset({'JPM', 'BAC', 'WFC', 'C', 'GS', 'MS', 'AXP', 'BRK.A', 'BRK.B'})),
+    ('HEALTHCARE', frozenset({'JNJ', 'PFE', 'UNH', 'ABBV', 'TMO', 'ABT', 'MRK', 'LLY', 'GILD', 'AMGN'})),
+    ('ENERGY', frozenset({'XOM', 'CVX', 'COP', 'EOG', 'SLB', 'MPC', 'VLO', 'PSX'})),
+)
+
+@lru_cache(maxsize=16384)
+def _estimate_market_cap_for(symbol: str) -> float:
+    """Estimate market cap based on symbol characteristics (cached - depends only on the symbol)"""
+    try:
+        # ETF market caps are not applicable - return 0
+        if symbol in _MARKET_CAP_ETFS:
+            return 0
+            
+        # For stocks, estimate based on typical market cap ranges by symbol characteristics
+        # Large cap tech (typically >$500B)
+        if symbol in _LARGE_CAP_TECH:
+            return 2000000000000  # $2T estimate
+            
+        # Major tech stocks (typically $100B-$1T)
+        if symbol in _MAJOR_TECH:
+            return 500000000000  # $500B estimate
+            
+        # Mid-cap stocks (typically $10B-$100B)
+        mid_cap_indicators = len(symbol) <= 4 and not any(char.isdigit() for char in symbol)
+        if mid_cap_indicators:
+            return 50000000000  # $50B estimate
+            
+        # Small-cap default
+        return 10000000000  # $10B estimate
+        
+    except Exception as e:
+        logger.debug(f"Market cap estimation failed for {symbol}: {e}")
+        return 25000000000  # Default $25B
+
+@lru_cache(maxsize=16384)
+def _sector_for(symbol: str) -> str:
+    """Get sector classification based on symbol characteristics (cached - depends only on the symbol)"""
+    try:
+        # ETFs
+        if symbol in _BROAD_ETFS:
+            return 'ETF'
+        
+        # Sector ETFs
+        if symbol in _SECTOR_ETFS:
+            return _SECTOR_ETFS[symbol]
+            
+        # Major technology, automotive/EV, financial, healthcare and energy companies
+        for sector, companies in _SECTOR_COMPANIES:
+            if symbol in companies:
+                return sector
+                
+        # Default classification based on symbol patterns
+        if len(symbol) <= 4 and symbol.isalpha():
+            return 'EQUITY'  # Generic equity
+        
+        return 'OTHER'
+        
+    except Exception as e:
+        logger.debug(f"Sector classification failed for {symbol}: {e}")
+        return 'UNKNOWN'
+
+def _sector_from_asset(asset: Dict) -> str:
+    """Sector for an asset universe entry (exchange and company name keywords as a proxy)"""
+    exchange = asset.get('exchange', '')
+    if exchange == 'NYSEARCA':
+        return 'EQUITY'  # ETFs
+    elif 'name' in asset:
+        name = asset['name'].upper()
+        if any(tech in name for tech in ['TECH', 'SOFTWARE', 'COMPUTER', 'DATA']):
+            return 'TECHNOLOGY'
+        elif any(health in name for health in ['HEALTH', 'PHARMA', 'BIO', 'MEDICAL']):
+            return 'HEALTHCARE'
+        elif any(fin in name for fin in ['BANK', 'FINANCIAL', 'INSURANCE']):
+            return 'FINANCIAL'
+        else:
+            return 'EQUITY'
+    return 'EQUITY'
+
+@njit(cache=True)
+def _latest_technicals_kernel(close, high, low):
+    """
+    RSI(14), MA10/20/50 and ATR(14) on the latest bar in a single pass over the tail
+    Inputs are float64 arrays with at least 15 bars; moving averages without enough history are NaN
+    """
+    n = len(close)
+    gain = 0.0
+    loss = 0.0
+    true_range = 0.0
+    for i in range(n - 14, n):
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            gain += delta
+        else:
+            loss -= delta
+        true_range += max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+    rsi = 100.0 if loss == 0 else 100.0 - 100.0 / (1.0 + gain / loss)
+    
+    ma_10 = close[n - 10:].mean()
+    ma_20 = close[n - 20:].mean() if n >= 20 else np.nan
+    ma_50 = close[n - 50:].mean() if n >= 50 else np.nan
+    return rsi, ma_10, ma_20, ma_50, true_range / 14.0
+
+@dataclass(**_DATACLASS_SLOTS)
 class MarketOpportunity:
     """Comprehensive market opportunity with discovery metadata"""
     symbol: str
@@ -66,31 +270,43 @@ class RateLimitTracker:
     """Sophisticated rate limit tracking with priority management"""
     
     def __init__(self):
-        self.request_history = deque(maxlen=200)  # Track last 200 requests
+        self.request_history = deque(maxlen=200)  # Monotonic timestamps of the last 200 requests
         self.budget_allocation = RATE_LIMIT_CONFIG['budget_allocation'].copy()
         self.used_budget = defaultdict(int)
         self.priority_queue = defaultdict(list)
         self.reset_time = datetime.now()
+        self._record_count = 0
         
-    def can_make_request(self, category: str, priority: int = 5) -> bool:
-        """Check if request can be made within budget and limits - UNLIMITED MODE"""
-        # With unlimited Alpha Vantage keys, always allow requests
-        # Just do basic cleanup to prevent memory bloat
-        now = datetime.now()
-        cutoff = now - timedelta(minutes=1)
+        # Per-minute admission limit, only applied when RATE_LIMIT_CONFIG['enforce'] is set
+        self.enforce = RATE_LIMIT_CONFIG.get('enforce', False)
+        self.max_requests_per_minute = int(RATE_LIMIT_CONFIG['max_requests_per_minute'] *
+                                           RATE_LIMIT_CONFIG['rate_limit_buffer'])
         
-        while self.request_history and self.request_history[0] < cutoff:
-            self.request_history.popleft()
+    def can_make_request(self, category: str, priority: int = 5) -> bool:
+        """Check if request can be made within budget and limits - UNLIMITED MODE unless enforcing"""
+        if not self.enforce:
+            # With unlimited Alpha Vantage keys, always allow requests
+            return True
             
-        # Always return True for unlimited scanning
-        return True
+        self._prune_history()
+        return len(self.request_history) < self.max_requests_per_minute
         
     def record_request(self, category: str):
         """Record API request"""
-        now = datetime.now()
-        self.request_history.append(now)
+        self.request_history.append(monotonic())
         self.used_budget[category] += 1
         
+        # Basic cleanup to prevent memory bloat, done periodically rather than per request
+        self._record_count += 1
+        if self._record_count % 128 == 0:
+            self._prune_history()
+            
+    def _prune_history(self):
+        """Drop requests older than one minute"""
+        cutoff = monotonic() - 60.0
+        while self.request_history and self.request_history[0] < cutoff:
+            self.request_history.popleft()
+        
     def reset_budgets(self):
         """Reset category budgets (called every minute)"""
         self.used_budget.clear()
@@ -122,12 +338,22 @@ class IntelligentMarketFunnel:
         self.current_watchlist: Dict[str, MarketOpportunity] = {}
         self.discovery_cache = {}
         self.market_regime = MarketRegime.BULL_TRENDING
+        self._regime_checks = {}  # MarketRegime -> specialized regime criteria check
         self.last_broad_scan = None
         self.scanning_active = False
         
         # Dynamic asset universe
         self.asset_universe = []  # All tradeable assets from Alpaca
-        self.last_universe_update = None
+        self._universe_sectors = None  # symbol -> sector, rebuilt when the universe changes
+        self._universe_sectors_source = None
+        self._universe_symbols = {}  # _UNIVERSE_FILTERS name -> symbol array, rebuilt when the universe changes
+        self._universe_symbols_source = None
+        self.last_universe_update = None  # time.monotonic() of the last refresh
+        self._rng = np.random.default_rng(FUNNEL_CONFIG.get('sampling_seed'))  # Universe probe sampling
+        
+        # Pooled HTTP session shared by the per-scan supplemental data providers (created on first use)
+        self._http_session = None
+        self._bars_cache = {}  # (symbol, days, min_bars) -> (monotonic() fetched, shared fetch task)
         
         # Performance tracking
         self.scan_statistics = {
@@ -137,42 +363,75 @@ class IntelligentMarketFunnel:
             'successful_trades': 0
         }
         
+    async def _new_data_provider(self):
+        """Supplemental data provider on the shared connection pool (its shutdown leaves the pool open)"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers={'User-Agent': 'TradingBot/1.0'}
+            )
+            
+        data_provider = SupplementalDataProvider(session=self._http_session)
+        await data_provider.initialize()
+        return data_provider
+        
+    async def _cached_bars(self, data_provider, symbol: str, days: int, min_bars: int) -> List[Dict]:
+        """
+        Supplemental bars shared across discovery sources for bars_cache_ttl_seconds
+        The fetch task is cached before it is awaited, so concurrent callers join the same request
+        """
+        key = (symbol, days, min_bars)
+        now = monotonic()
+        entry = self._bars_cache.get(key)
+        if entry is None or now - entry[0] > FUNNEL_CONFIG.get('bars_cache_ttl_seconds', 45):
+            task = asyncio.create_task(data_provider.get_historical_data(symbol, days=days, min_bars=min_bars))
+            entry = (now, task)
+            self._bars_cache[key] = entry
+            
+            def evict_unusable(done: asyncio.Task):
+                # Empty results (e.g. a provider out of rate budget) and failures are retried by the next caller
+                if done.cancelled() or done.exception() is not None or not done.result():
+                    if self._bars_cache.get(key, (None, None))[1] is done:
+                        del self._bars_cache[key]
+                        
+            task.add_done_callback(evict_unusable)
+            
+        # Shielded so one cancelled caller does not cancel the fetch for the others
+        return await asyncio.shield(entry[1])
+        
+    def _purge_bars_cache(self):
+        """Drop shared bars older than the cache TTL"""
+        cutoff = monotonic() - FUNNEL_CONFIG.get('bars_cache_ttl_seconds', 45)
+        self._bars_cache = {key: entry for key, entry in self._bars_cache.items() if entry[0] >= cutoff}
+        
+    async def shutdown(self):
+        """Close the shared HTTP session"""
+        try:
+            if self._http_session and not self._http_session.closed:
+                await self._http_session.close()
+                logger.info("✅ Market funnel HTTP session closed cleanly")
+        except Exception as e:
+            logger.warning(f"⚠️ Market funnel shutdown warning: {e}")
+        finally:
+            self._http_session = None
+            
     async def _update_asset_universe(self):
         """Update the dynamic asset universe from Alpaca"""
         try:
             # Update universe once per day or if empty
-            now = datetime.now()
+            now = monotonic()
             if (not self.asset_universe or 
-                not self.last_universe_update or
-                (now - self.last_universe_update).total_seconds() > 86400):  # 24 hours
+                self.last_universe_update is None or
+                now - self.last_universe_update > 86400):  # 24 hours
                 
                 logger.info("🔄 Updating dynamic asset universe...")
                 assets = await self.gateway.get_all_assets()
                 
                 if assets:
-                    # Filter out problematic symbols
-                    filtered_assets = []
-                    for asset in assets:
-                        symbol = asset['symbol']
-                        
-                        # Skip crypto and forex
-                        crypto_patterns = ['USD', 'BTC', 'ETH', 'USDT', 'EUR', 'GBP', 'JPY', 'CRYPTO', 'COIN']
-                        if any(crypto in symbol.upper() for crypto in crypto_patterns):
-                            continue
-                            
-                        # Skip USD-ending symbols
-                        if symbol.upper().endswith('USD'):
-                            continue
-                            
-                        # Skip very long symbols (likely derivatives)
-                        if len(symbol) > 5:
-                            continue
-                            
-                        # Skip symbols with special characters
-                        if not symbol.replace('.', '').replace('-', '').isalnum():
-                            continue
-                            
-                        filtered_assets.append(asset)
+                    # Filter out crypto/forex, long (likely derivative) and special-character symbols
+                    filtered_assets = [asset for asset in assets
+                                       if _TRADEABLE_SYMBOL_RE.fullmatch(asset['symbol'].upper())]
                     
                     self.asset_universe = filtered_assets
                     self.last_universe_update = now
@@ -194,12 +453,13 @@ class IntelligentMarketFunnel:
                 return list(self.current_watchlist.values())
                 
             self.scanning_active = True
-            start_time = datetime.now()
+            start_time = monotonic()
             
             logger.info("🔍 Starting intelligent market funnel scan...")
             
             # First, ensure we have a current asset universe
             await self._update_asset_universe()
+            self._purge_bars_cache()
             
             # STEP 1: Broad Market Scan (2-5 API calls)
             broad_candidates = await self._execute_broad_scan()
@@ -221,7 +481,7 @@ class IntelligentMarketFunnel:
             await self._update_dynamic_watchlist(final_opportunities)
             
             # Update statistics
-            scan_duration = (datetime.now() - start_time).total_seconds()
+            scan_duration = monotonic() - start_time
             self.scan_statistics['total_scans'] += 1
             self.scan_statistics['opportunities_found'] += len(final_opportunities)
             
@@ -299,70 +559,57 @@ class IntelligentMarketFunnel:
         try:
             all_candidates = []
             api_calls_used = 0
+            broad_scan_apis = FUNNEL_CONFIG['broad_scan_apis']
+            
+            # The discovery sources are independent, so they all run at once;
+            # results are merged in this fixed order (dedup keeps the first of equal-priority duplicates)
+            sources = []  # (label, coroutine)
             
             # 1. Market Movers (Top Gainers/Losers) - 2 API calls
-            if FUNNEL_CONFIG['broad_scan_apis']['market_movers']:
-                if self.rate_limiter.can_make_request('discovery', priority=4):
-                    gainers = await self._get_market_movers('gainers')
-                    self.rate_limiter.record_request('discovery')
-                    api_calls_used += 1
-                    
-                if self.rate_limiter.can_make_request('discovery', priority=4):
-                    losers = await self._get_market_movers('losers')
-                    self.rate_limiter.record_request('discovery')
-                    api_calls_used += 1
-                    
-                    movers = (gainers or []) + (losers or [])
-                    all_candidates.extend(movers)
-                    logger.debug(f"Market movers: {len(movers)} candidates")
-                    
-            # 2. Most Active Stocks (Volume Leaders) - 1 API call
-            if FUNNEL_CONFIG['broad_scan_apis']['most_active']:
-                if self.rate_limiter.can_make_request('discovery', priority=4):
-                    active_stocks = await self._get_most_active_stocks()
-                    self.rate_limiter.record_request('discovery')
-                    api_calls_used += 1
-                    
-                    if active_stocks:
-                        all_candidates.extend(active_stocks)
-                        logger.debug(f"Most active: {len(active_stocks)} candidates")
+            if broad_scan_apis['market_movers']:
+                for direction in ('gainers', 'losers'):
+                    if self.rate_limiter.can_make_request('discovery', priority=4):
+                        sources.append((f"Market {direction}", self._get_market_movers(direction)))
                         
+            # 2. Most Active Stocks (Volume Leaders) - 1 API call
+            if broad_scan_apis['most_active'] and self.rate_limiter.can_make_request('discovery', priority=4):
+                sources.append(("Most active", self._get_most_active_stocks()))
+                
             # 3. News-Driven Movers - 1 API call
-            if FUNNEL_CONFIG['broad_scan_apis']['news_movers']:
-                if self.rate_limiter.can_make_request('discovery', priority=4):
-                    news_movers = await self._get_news_driven_movers()
-                    self.rate_limiter.record_request('discovery')
-                    api_calls_used += 1
-                    
-                    if news_movers:
-                        all_candidates.extend(news_movers)
-                        logger.debug(f"News movers: {len(news_movers)} candidates")
-                        
+            if broad_scan_apis['news_movers'] and self.rate_limiter.can_make_request('discovery', priority=4):
+                sources.append(("News movers", self._get_news_driven_movers()))
+                
             # 4. Unusual Volume Detection - 1 API call
-            if FUNNEL_CONFIG['broad_scan_apis']['unusual_volume']:
-                if self.rate_limiter.can_make_request('discovery', priority=4):
-                    volume_anomalies = await self._detect_unusual_volume()
-                    self.rate_limiter.record_request('discovery')
-                    api_calls_used += 1
-                    
-                    if volume_anomalies:
-                        all_candidates.extend(volume_anomalies)
-                        logger.debug(f"Volume anomalies: {len(volume_anomalies)} candidates")
-                        
-            # Deduplicate and apply basic filters
-            unique_candidates = self._deduplicate_candidates(all_candidates)
-            filtered_candidates = self._apply_basic_filters(unique_candidates)
+            if broad_scan_apis['unusual_volume'] and self.rate_limiter.can_make_request('discovery', priority=4):
+                sources.append(("Volume anomalies", self._detect_unusual_volume()))
+                
+            # 5. Add comprehensive market scan for unlimited Alpha Vantage scenario
+            comprehensive_scan = (broad_scan_apis.get('comprehensive_scan', False) and
+                                  self.rate_limiter.can_make_request('discovery', priority=3))
             
-            logger.info(f"📊 Broad scan: {api_calls_used} API calls → {len(filtered_candidates)} candidates")
-            self.scan_statistics['api_calls_used'] += api_calls_used
+            results = await asyncio.gather(
+                *(coroutine for _, coroutine in sources),
+                *((self._execute_comprehensive_market_scan(),) if comprehensive_scan else ()),
+                return_exceptions=True
+            )
             
-            # 5. Add comprehensive market scan for unlimited Alpha Vantage scenario
-            if FUNNEL_CONFIG['broad_scan_apis'].get('comprehensive_scan', False):
-                if self.rate_limiter.can_make_request('discovery', priority=3):
-                    comprehensive_results = await self._execute_comprehensive_market_scan()
-                    if comprehensive_results:
-                        all_candidates.extend(comprehensive_results)
-                        logger.info(f"Comprehensive scan: {len(comprehensive_results)} additional candidates")
+            for (label, _), result in zip(sources, results):
+                self.rate_limiter.record_request('discovery')
+                api_calls_used += 1
+                
+                if isinstance(result, Exception):
+                    logger.warning(f"⚠️ {label} discovery failed: {result}")
+                elif result:
+                    all_candidates.extend(result)
+                    logger.debug(f"{label}: {len(result)} candidates")
+                    
+            if comprehensive_scan:
+                comprehensive_results = results[-1]
+                if isinstance(comprehensive_results, Exception):
+                    logger.warning(f"⚠️ Comprehensive scan failed: {comprehensive_results}")
+                elif comprehensive_results:
+                    all_candidates.extend(comprehensive_results)
+                    logger.info(f"Comprehensive scan: {len(comprehensive_results)} additional candidates")
             
             # Deduplicate and apply basic filters
             unique_candidates = self._deduplicate_candidates(all_candidates)
@@ -401,60 +648,70 @@ class IntelligentMarketFunnel:
                 account_value = None
             
             filtered_candidates = []
-            sector_counts = {}  # Track sector diversification (Grok feedback)
+            sector_counts = Counter()  # Track sector diversification (Grok feedback)
             price_filtered_count = 0
             
+            regime_check = self._regime_checks.get(self.market_regime)
+            if regime_check is None:
+                regime_check = self._regime_checks[self.market_regime] = self._compile_regime_check(regime_criteria)
+            
+            # Account-size-aware price filtering (prioritize affordable stocks for small accounts)
+            small_account = bool(account_value) and account_value < 10000
+            max_affordable_price = (account_value * 0.08) / 1.05 if small_account else None  # 8% of account after slippage
+            account_label = f"{account_value:,.0f}" if small_account else ""
+            
+            eligible = []
             for candidate in candidates:
-                # Account-size-aware price filtering (prioritize affordable stocks for small accounts)
-                if account_value and account_value < 10000:
-                    # For small accounts, prioritize stocks that allow proper position sizing
-                    expensive_stocks = ['GOOGL', 'GOOG', 'AMZN', 'TSLA', 'BRK.A', 'BRK.B', 'NVDA', 'META']
-                    max_affordable_price = (account_value * 0.08) / 1.05  # 8% of account after slippage
-                    
-                    if (candidate.symbol in expensive_stocks or 
-                        candidate.current_price > max_affordable_price):
-                        price_filtered_count += 1
-                        logger.debug(f"💰 {candidate.symbol}: Filtered due to price ${candidate.current_price:.0f} (>${max_affordable_price:.0f} max for ${account_value:,.0f} account)")
-                        continue
+                # For small accounts, prioritize stocks that allow proper position sizing
+                if small_account and (candidate.symbol in _EXPENSIVE_STOCKS or 
+                                      candidate.current_price > max_affordable_price):
+                    price_filtered_count += 1
+                    logger.debug("💰 %s: Filtered due to price $%.0f (>$%.0f max for $%s account)",
+                                 candidate.symbol, candidate.current_price, max_affordable_price, account_label)
+                    continue
                 
                 # Apply market regime filters
-                meets_criteria = self._meets_regime_criteria(candidate, regime_criteria)
-                logger.debug(f"📊 {candidate.symbol}: change={candidate.daily_change_pct:.1f}%, vol_ratio={candidate.volume_ratio:.1f}, sector={candidate.sector}, meets_criteria={meets_criteria}")
-                
+                meets_criteria = regime_check(candidate)
+                logger.debug("📊 %s: change=%.1f%%, vol_ratio=%.1f, sector=%s, meets_criteria=%s",
+                             candidate.symbol, candidate.daily_change_pct, candidate.volume_ratio, candidate.sector, meets_criteria)
                 if meets_criteria:
-                    # Calculate preliminary opportunity score
-                    candidate.opportunity_score = self._calculate_preliminary_score(
-                        candidate, market_context, regime_criteria
-                    )
+                    eligible.append(candidate)
+            
+            # Calculate preliminary opportunity scores for all eligible candidates in one pass,
+            # and keep only those above threshold (rejected candidates are discarded unscored)
+            scores = self._calculate_preliminary_scores(eligible, market_context, regime_criteria)
+            keep = np.flatnonzero(scores >= 0.2)  # Restored to reasonable threshold
+            if len(keep) < len(eligible):
+                logger.debug("   ❌ %d candidates below score threshold 0.2", len(eligible) - len(keep))
+            
+            # Apply sector diversification (Grok's recommendation) in discovery order
+            for i in keep.tolist():
+                candidate = eligible[i]
+                candidate.opportunity_score = score = float(scores[i])
+                
+                candidate_sector = getattr(candidate, 'sector', 'UNKNOWN')
+                current_sector_count = sector_counts[candidate_sector]
+                
+                # Limit sector concentration (max 3 per sector)
+                if current_sector_count < 3:
+                    logger.debug("   ✅ %s: score=%.2f, sector=%s (%d/3)",
+                                 candidate.symbol, score, candidate_sector, current_sector_count + 1)
+                elif score > 0.8:  # Exception for high-quality opportunities
+                    logger.info(f"🎯 High-quality sector exception: {candidate.symbol} ({candidate_sector}) score={score:.2f}")
+                else:
+                    logger.debug("   🚫 %s: sector limit reached for %s (%d/3)",
+                                 candidate.symbol, candidate_sector, current_sector_count)
+                    continue
                     
-                    if candidate.opportunity_score >= 0.2:  # Restored to reasonable threshold
-                        # Apply sector diversification (Grok's recommendation)
-                        candidate_sector = getattr(candidate, 'sector', 'UNKNOWN')
-                        current_sector_count = sector_counts.get(candidate_sector, 0)
-                        
-                        # Limit sector concentration (max 3 per sector)
-                        if current_sector_count < 3:
-                            filtered_candidates.append(candidate)
-                            sector_counts[candidate_sector] = current_sector_count + 1
-                            logger.debug(f"   ✅ {candidate.symbol}: score={candidate.opportunity_score:.2f}, sector={candidate_sector} ({current_sector_count+1}/3)")
-                        elif candidate.opportunity_score > 0.8:  # Exception for high-quality opportunities
-                            filtered_candidates.append(candidate)
-                            sector_counts[candidate_sector] = current_sector_count + 1
-                            logger.info(f"🎯 High-quality sector exception: {candidate.symbol} ({candidate_sector}) score={candidate.opportunity_score:.2f}")
-                        else:
-                            logger.debug(f"   🚫 {candidate.symbol}: sector limit reached for {candidate_sector} ({current_sector_count}/3)")
-                    else:
-                        logger.debug(f"   ❌ {candidate.symbol}: score={candidate.opportunity_score:.2f} (below threshold)")
+                filtered_candidates.append(candidate)
+                sector_counts[candidate_sector] = current_sector_count + 1
                         
             # Sort by opportunity score and return top candidates
-            filtered_candidates.sort(key=lambda x: x.opportunity_score, reverse=True)
-            top_candidates = filtered_candidates[:FUNNEL_CONFIG['deep_dive_candidates']]
+            top_candidates = heapq.nlargest(FUNNEL_CONFIG['deep_dive_candidates'], filtered_candidates,
+                                            key=_BY_OPPORTUNITY_SCORE)
             
             # Log sector distribution for transparency
-            final_sectors = {}
-            for candidate in top_candidates:
-                sector = getattr(candidate, 'sector', 'UNKNOWN')
-                final_sectors[sector] = final_sectors.get(sector, 0) + 1
+            final_sectors = Counter(getattr(candidate, 'sector', 'UNKNOWN') for candidate in top_candidates)
             
             logger.info(f"🧠 AI filtering: {len(candidates)} → {len(top_candidates)} candidates "
                        f"(regime: {self.market_regime.value})")
@@ -476,49 +733,84 @@ class IntelligentMarketFunnel:
         Target: 20-30 candidates → 5-10 high-conviction opportunities
         """
         try:
-            analyzed_opportunities = []
-            api_calls_used = 0
             max_api_calls = FUNNEL_CONFIG['deep_dive_api_budget']
-            
-            for candidate in candidates:
-                if api_calls_used >= max_api_calls:
-                    logger.warning(f"Deep dive API budget exhausted at {api_calls_used} calls")
-                    break
+            semaphore = asyncio.Semaphore(FUNNEL_CONFIG.get('deep_dive_concurrency', 10))
+            budget_lock = asyncio.Lock()
+            budget = {'used': 0, 'exhausted_logged': False}
+            
+            async def reserve_api_call() -> bool:
+                """Claim one call from the shared deep dive budget"""
+                async with budget_lock:
+                    if budget['used'] >= max_api_calls:
+                        return False
+                    budget['used'] += 1
+                    return True
+            
+            async def release_api_call():
+                """Return an unused reservation (the call produced no data)"""
+                async with budget_lock:
+                    budget['used'] -= 1
+            
+            # Detailed technical analysis for every candidate in one multi-symbol request
+            technicals = {}
+            if self.rate_limiter.can_make_request('analysis', priority=3) and await reserve_api_call():
+                technicals = await self._get_bulk_technicals([candidate.symbol for candidate in candidates])
+                if technicals:
+                    self.rate_limiter.record_request('analysis')
+                else:
+                    await release_api_call()
+            
+            async def analyze_candidate(candidate: MarketOpportunity) -> Optional[MarketOpportunity]:
+                async with semaphore:
+                    async with budget_lock:
+                        if budget['used'] >= max_api_calls:
+                            if not budget['exhausted_logged']:
+                                logger.warning(f"Deep dive API budget exhausted at {budget['used']} calls")
+                                budget['exhausted_logged'] = True
+                            return None  # Candidate is not analyzed
                     
-                # Detailed technical analysis
-                if self.rate_limiter.can_make_request('analysis', priority=3):
-                    technical_data = await self._get_detailed_technicals(candidate.symbol)
+                    technical_data = technicals.get(candidate.symbol)
                     if technical_data:
                         candidate = self._update_candidate_technicals(candidate, technical_data)
-                        self.rate_limiter.record_request('analysis')
-                        api_calls_used += 1
-                        
-                # News analysis for catalyst detection
-                if (NEWS_CONFIG['enable_news_analysis'] and 
-                    self.rate_limiter.can_make_request('analysis', priority=3)):
-                    news_data = await self._get_news_analysis(candidate.symbol)
-                    if news_data:
-                        candidate = self._update_candidate_news(candidate, news_data)
-                        self.rate_limiter.record_request('analysis')
-                        api_calls_used += 1
-                        
-                # AI-powered final scoring
-                final_score = await self._calculate_final_ai_score(candidate)
-                candidate.opportunity_score = final_score
-                candidate.last_analysis = datetime.now()
-                candidate.times_analyzed += 1
-                
+                            
+                    # News analysis for catalyst detection
+                    if (NEWS_CONFIG['enable_news_analysis'] and 
+                        self.rate_limiter.can_make_request('analysis', priority=3) and
+                        await reserve_api_call()):
+                        news_data = await self._get_news_analysis(candidate.symbol)
+                        if news_data:
+                            candidate = self._update_candidate_news(candidate, news_data)
+                            self.rate_limiter.record_request('analysis')
+                        else:
+                            await release_api_call()
+                            
+                    # AI-powered final scoring
+                    final_score = await self._calculate_final_ai_score(candidate)
+                    candidate.opportunity_score = final_score
+                    candidate.last_analysis = datetime.now()
+                    candidate.times_analyzed += 1
+                    return candidate
+            
+            results = await asyncio.gather(*(analyze_candidate(candidate) for candidate in candidates),
+                                           return_exceptions=True)
+            
+            analyzed_opportunities = []
+            for candidate, result in zip(candidates, results):
+                if isinstance(result, Exception):
+                    logger.debug(f"Deep dive failed for {candidate.symbol}: {result}")
+                    continue
+                if result is None:
+                    continue
                 # Only keep high-conviction opportunities
-                if candidate.opportunity_score >= 0.7 and candidate.confidence >= 0.6:
-                    analyzed_opportunities.append(candidate)
+                if result.opportunity_score >= 0.7 and result.confidence >= 0.6:
+                    analyzed_opportunities.append(result)
+            api_calls_used = budget['used']
                     
-            # Final ranking by AI opportunity score
-            analyzed_opportunities.sort(key=lambda x: x.opportunity_score, reverse=True)
-            
             logger.info(f"🎯 Deep dive: {api_calls_used} API calls → {len(analyzed_opportunities)} opportunities")
             self.scan_statistics['api_calls_used'] += api_calls_used
             
-            return analyzed_opportunities[:10]  # Top 10 opportunities
+            # Final ranking by AI opportunity score - top 10 opportunities
+            return heapq.nlargest(10, analyzed_opportunities, key=_BY_OPPORTUNITY_SCORE)
             
         except Exception as e:
             logger.error(f"Deep dive analysis failed: {e}")
@@ -531,33 +823,14 @@ class IntelligentMarketFunnel:
             movers_data = await self.gateway.get_market_movers(direction, limit=25)
             
             opportunities = []
+            discovery_time = datetime.now()  # One timestamp for the whole batch
             for data in movers_data:
                 # Parse real Alpaca API response
                 symbol = data.get('symbol', '')
                 
-                # Skip crypto and forex symbols - comprehensive filtering
-                crypto_patterns = ['USD', 'BTC', 'ETH', 'USDT', 'EUR', 'GBP', 'JPY', 'CRYPTO', 'COIN']
-                if any(crypto in symbol.upper() for crypto in crypto_patterns):
-                    logger.debug(f"Skipping crypto/forex symbol: {symbol}")
-                    continue
-                
-                # Skip invalid or problematic symbols
-                invalid_symbols = ['NDTAF', 'BRK.A', 'BRK.B']  # Common invalid/problematic symbols
-                invalid_patterns = ['.A', '.B', 'TEST', 'TEMP']
-                if (symbol in invalid_symbols or 
-                    any(pattern in symbol for pattern in invalid_patterns) or
-                    len(symbol) > 5 or len(symbol) < 1):
-                    logger.debug(f"Skipping invalid symbol: {symbol}")
-                    continue
-                    
-                # Skip if symbol ends with USD (common crypto pattern)
-                if symbol.upper().endswith('USD'):
-                    logger.debug(f"Skipping USD-ending symbol: {symbol}")
-                    continue
-                    
-                # Skip if symbol is too long (likely crypto pair)
-                if len(symbol) > 5:
-                    logger.debug(f"Skipping long symbol: {symbol}")
+                # Skip crypto/forex and invalid or problematic symbols
+                if _is_rejected_symbol(symbol):
+                    logger.debug("Skipping crypto/forex or invalid symbol: %s", symbol)
                     continue
                 
                 price = float(data.get('price', 0)) if data.get('price') else 0
@@ -565,18 +838,8 @@ class IntelligentMarketFunnel:
                 volume = int(data.get('volume', 0)) if data.get('volume') else 0
                 
                 if symbol and price > SCREENING_CRITERIA['min_price']:
-                    opportunity = MarketOpportunity(
-                        symbol=symbol,
-                        discovery_source=f'market_{direction}',
-                        discovery_timestamp=datetime.now(),
-                        current_price=price,
-                        daily_change_pct=change_pct,
-                        volume=volume,
-                        avg_volume=volume / 1.5,  # Estimate from volume
-                        volume_ratio=1.5,
-                        market_cap=self._estimate_market_cap(symbol),
-                        sector=self._get_sector(symbol),
-                    )
+                    opportunity = self._make_opportunity(symbol, f'market_{direction}', discovery_time, price,
+                                                         change_pct, volume, 1.5)
                     opportunities.append(opportunity)
                     
             # Fallback to dynamic discovery if API returns no data
@@ -600,44 +863,49 @@ class IntelligentMarketFunnel:
         logger.info(f"🔍 Dynamic discovery: scanning {len(self.asset_universe)} assets for {direction}")
         
         # Sample from universe - focus on liquid, major exchange symbols
-        candidate_symbols = []
-        for asset in self.asset_universe:
-            symbol = asset['symbol']
-            if (asset.get('exchange') in ['NYSE', 'NASDAQ', 'NYSEARCA'] and 
-                len(symbol) <= 4 and symbol.isalpha()):
-                candidate_symbols.append(symbol)
-        
-        # More comprehensive sampling for better opportunity discovery
-        import random
+        candidate_symbols = self._get_universe_symbols('liquid')
         
         # With unlimited Alpha Vantage keys, scan much more comprehensively
         sample_size = min(100, len(candidate_symbols))  # Fast execution - focus on top candidates
-        test_symbols = random.sample(candidate_symbols, sample_size)
+        test_symbols = self._rng.choice(candidate_symbols, size=sample_size, replace=False).tolist()
         
         opportunities = []
         symbols_tested = 0
         
-        for symbol in test_symbols:
+        # Probe all sampled symbols concurrently, bounded so the data sources are not flooded
+        semaphore = asyncio.Semaphore(FUNNEL_CONFIG.get('dynamic_discovery_concurrency', 20))
+        
+        # One supplemental data provider for the whole scan (avoids Alpaca rate limits, shares its own limits)
+        data_provider = await self._new_data_provider()
+        
+        async def fetch_bars(symbol: str) -> List[Dict]:
+            async with semaphore:
+                return await self._cached_bars(data_provider, symbol, days=2, min_bars=2)
+                    
+        try:
+            bars_by_symbol = await asyncio.gather(*(fetch_bars(symbol) for symbol in test_symbols),
+                                                  return_exceptions=True)
+        finally:
+            await data_provider.shutdown()
+        
+        discovery_time = datetime.now()  # One timestamp for the whole batch
+        # Signed move must exceed 0.2% (reduced from 0.5%): +1 keeps gains, -1 keeps losses
+        direction_sign = {'gainers': 1.0, 'losers': -1.0}.get(direction, 0.0)
+        source = f'dynamic_{direction}'
+        for symbol, bars in zip(test_symbols, bars_by_symbol):
             if len(opportunities) >= 100:  # Find up to 100 opportunities per direction
                 break
                 
             try:
-                # Use supplemental data provider to avoid Alpaca rate limits
-                from supplemental_data_provider import SupplementalDataProvider
-                
-                data_provider = SupplementalDataProvider()
-                await data_provider.initialize()
-                
-                try:
-                    bars = await data_provider.get_historical_data(symbol, days=2, min_bars=2)
-                finally:
-                    await data_provider.shutdown()
+                if isinstance(bars, Exception):
+                    raise bars
                 if not bars or len(bars) < 2:
                     continue
                     
-                current_price = float(bars[-1].get('c', 0))
-                prev_price = float(bars[-2].get('c', current_price))
-                volume = int(bars[-1].get('v', 0))
+                current_price, volume = _BAR_CLOSE_VOLUME(bars[-1])
+                current_price = float(current_price)
+                volume = int(volume)
+                prev_price = float(bars[-2]['c'])
                 
                 if current_price < SCREENING_CRITERIA['min_price'] or volume == 0:
                     continue
@@ -645,34 +913,9 @@ class IntelligentMarketFunnel:
                 change_pct = ((current_price - prev_price) / prev_price) * 100 if prev_price > 0 else 0
                 
                 # Filter based on direction and minimum movement - more lenient thresholds
-                if direction == 'gainers' and change_pct > 0.2:  # Reduced from 0.5% to 0.2% gain
-                    opportunity = MarketOpportunity(
-                        symbol=symbol,
-                        discovery_source=f'dynamic_{direction}',
-                        discovery_timestamp=datetime.now(),
-                        current_price=current_price,
-                        daily_change_pct=change_pct,
-                        volume=volume,
-                        avg_volume=volume / 1.5,
-                        volume_ratio=1.5,
-                        market_cap=self._estimate_market_cap(symbol),
-                        sector=self._get_sector_from_universe(symbol),
-                    )
-                    opportunities.append(opportunity)
-                elif direction == 'losers' and change_pct < -0.2:  # Reduced from -0.5% to -0.2% loss
-                    opportunity = MarketOpportunity(
-                        symbol=symbol,
-                        discovery_source=f'dynamic_{direction}',
-                        discovery_timestamp=datetime.now(),
-                        current_price=current_price,
-                        daily_change_pct=change_pct,
-                        volume=volume,
-                        avg_volume=volume / 1.5,
-                        volume_ratio=1.5,
-                        market_cap=self._estimate_market_cap(symbol),
-                        sector=self._get_sector_from_universe(symbol),
-                    )
-                    opportunities.append(opportunity)
+                if direction_sign * change_pct > 0.2:
+                    opportunities.append(self._make_opportunity(symbol, source, discovery_time, current_price,
+                                                                change_pct, volume, 1.5, universe_sector=True))
                     
                 symbols_tested += 1
                     
@@ -695,31 +938,25 @@ class IntelligentMarketFunnel:
         logger.info(f"🔍 COMPREHENSIVE SCAN: Analyzing large portion of {len(self.asset_universe)} stocks")
         
         # Filter to high-quality candidates
-        quality_symbols = []
-        for asset in self.asset_universe:
-            symbol = asset['symbol']
-            if (asset.get('exchange') in ['NYSE', 'NASDAQ', 'NYSEARCA'] and 
-                len(symbol) <= 5 and symbol.isalpha() and
-                not any(bad in symbol for bad in ['WARR', 'UNIT', 'RIGHT'])):
-                quality_symbols.append(symbol)
+        quality_symbols = self._get_universe_symbols('quality')
         
         # Optimize sample size for real-time performance
-        import random
         comprehensive_sample_size = min(1000, len(quality_symbols))  # Reduced to 1000 for faster execution
-        test_symbols = random.sample(quality_symbols, comprehensive_sample_size)
+        test_symbols = self._rng.choice(quality_symbols, size=comprehensive_sample_size, replace=False).tolist()
         
         logger.info(f"🔄 Comprehensive scan: analyzing {len(test_symbols)} high-quality stocks")
         
         opportunities = []
         batch_size = 50  # Smaller batches for faster processing
         
-        # Process batches in parallel for much faster execution
-        import asyncio
+        # Process batches in parallel, with one shared bound on in-flight symbol fetches
+        semaphore = asyncio.Semaphore(FUNNEL_CONFIG.get('comprehensive_scan_concurrency', 32))
+        discovery_time = datetime.now()  # One timestamp for the whole scan
         
         tasks = []
         for i in range(0, len(test_symbols), batch_size):
             batch = test_symbols[i:i + batch_size]
-            task = self._analyze_symbol_batch_parallel(batch)
+            task = self._analyze_symbol_batch_parallel(batch, semaphore, discovery_time)
             tasks.append(task)
         
         # Execute all batches in parallel
@@ -738,23 +975,28 @@ class IntelligentMarketFunnel:
         logger.info(f"🎯 COMPREHENSIVE SCAN COMPLETE: {len(opportunities)} total opportunities from {len(test_symbols)} stocks")
         return opportunities
     
-    async def _analyze_symbol_batch_parallel(self, symbols: List[str]) -> List[MarketOpportunity]:
+    async def _analyze_symbol_batch_parallel(self, symbols: List[str],
+                                             semaphore: Optional[asyncio.Semaphore] = None,
+                                             discovery_time: Optional[datetime] = None) -> List[MarketOpportunity]:
         """Analyze a batch of symbols with parallel data fetching for speed"""
         opportunities = []
         
-        # Create one data provider for this batch to reuse connection
-        from supplemental_data_provider import SupplementalDataProvider
-        data_provider = SupplementalDataProvider()
-        await data_provider.initialize()
-        
+        # One multi-symbol Alpaca request covers the batch; the supplemental provider fills in any gaps
         try:
-            # Process symbols in parallel within the batch
-            import asyncio
+            bulk_bars = await self.gateway.get_bars_bulk(symbols, timeframe='1Day', limit=3)
+        except Exception as e:
+            logger.debug(f"Bulk bars unavailable for comprehensive batch: {e}")
+            bulk_bars = {}
             
-            # Create tasks for parallel data fetching
+        # Create one data provider for this batch (rate limits shared across the batch)
+        data_provider = await self._new_data_provider()
+        
+        try:
+            # Symbols with bulk bars are analyzed without another request; the rest fetch in parallel
             tasks = []
             for symbol in symbols:
-                task = self._analyze_single_symbol_fast(symbol, data_provider)
+                task = self._analyze_single_symbol_fast(symbol, data_provider, semaphore, bulk_bars.get(symbol),
+                                                        discovery_time)
                 tasks.append(task)
             
             # Execute all symbol analyses in parallel
@@ -772,16 +1014,32 @@ class IntelligentMarketFunnel:
             
         return opportunities
     
-    async def _analyze_single_symbol_fast(self, symbol: str, data_provider) -> Optional[MarketOpportunity]:
-        """Fast analysis of a single symbol"""
+    async def _analyze_single_symbol_fast(self, symbol: str, data_provider,
+                                          semaphore: Optional[asyncio.Semaphore] = None,
+                                          bars: Optional[List[Dict]] = None,
+                                          discovery_time: Optional[datetime] = None) -> Optional[MarketOpportunity]:
+        """
+        Fast analysis of a single symbol (the optional semaphore bounds concurrent fetches)
+        Prefetched bars with at least two entries are used as-is instead of fetching;
+        discovery_time is the caller's scan timestamp (now if not given)
+        """
         try:
-            bars = await data_provider.get_historical_data(symbol, days=3, min_bars=2)
             if not bars or len(bars) < 2:
+                if semaphore is None:
+                    bars = await self._cached_bars(data_provider, symbol, days=3, min_bars=2)
+                else:
+                    async with semaphore:
+                        bars = await self._cached_bars(data_provider, symbol, days=3, min_bars=2)
+            bar_count = len(bars) if bars else 0
+            if bar_count < 2:
                 return None
                 
-            current_price = float(bars[-1].get('c', 0))
-            prev_price = float(bars[-2].get('c', current_price))
-            volume = int(bars[-1].get('v', 0))
+            last_bar = bars[-1]
+            prev_bar = bars[-2]
+            current_price, volume = _BAR_CLOSE_VOLUME(last_bar)
+            current_price = float(current_price)
+            volume = int(volume)
+            prev_price = float(prev_bar['c'])
             
             # Skip if below minimum criteria
             if current_price < SCREENING_CRITERIA['min_price'] or volume < 100000:
@@ -790,84 +1048,23 @@ class IntelligentMarketFunnel:
             change_pct = ((current_price - prev_price) / prev_price) * 100 if prev_price > 0 else 0
             
             # Look for any significant movement or volume
-            avg_volume = sum(int(bar.get('v', 0)) for bar in bars) / len(bars) if bars else volume
+            if bar_count == 3:  # Bulk prefetch shape (limit=3) - unrolled
+                avg_volume = (bars[0]['v'] + prev_bar['v'] + last_bar['v']) / 3
+            else:
+                avg_volume = sum(map(_BAR_VOLUME, bars)) / bar_count
             volume_ratio = volume / avg_volume if avg_volume > 0 else 1.0
             
             # More inclusive criteria for comprehensive scan
             if (abs(change_pct) > 0.1 or volume_ratio > 1.2):  # 0.1% move OR 20% volume increase
-                return MarketOpportunity(
-                    symbol=symbol,
-                    discovery_source='comprehensive_scan',
-                    discovery_timestamp=datetime.now(),
-                    current_price=current_price,
-                    daily_change_pct=change_pct,
-                    volume=volume,
-                    avg_volume=avg_volume,
-                    volume_ratio=volume_ratio,
-                    market_cap=self._estimate_market_cap(symbol),
-                    sector=self._get_sector_from_universe(symbol),
-                )
+                return self._make_opportunity(symbol, 'comprehensive_scan', discovery_time or datetime.now(),
+                                              current_price, change_pct, volume, volume_ratio,
+                                              avg_volume=avg_volume, universe_sector=True)
             return None
             
         except Exception as e:
             logger.debug(f"Failed to analyze {symbol} in fast mode: {e}")
             return None
     
-    async def _analyze_symbol_batch(self, symbols: List[str]) -> List[MarketOpportunity]:
-        """Analyze a batch of symbols for opportunities"""
-        opportunities = []
-        
-        for symbol in symbols:
-            try:
-                # Use supplemental data provider instead of Alpaca to avoid rate limits
-                from supplemental_data_provider import SupplementalDataProvider
-                
-                data_provider = SupplementalDataProvider()
-                await data_provider.initialize()
-                
-                try:
-                    bars = await data_provider.get_historical_data(symbol, days=3, min_bars=2)
-                finally:
-                    await data_provider.shutdown()
-                if not bars or len(bars) < 2:
-                    continue
-                    
-                current_price = float(bars[-1].get('c', 0))
-                prev_price = float(bars[-2].get('c', current_price))
-                volume = int(bars[-1].get('v', 0))
-                
-                # Skip if below minimum criteria
-                if current_price < SCREENING_CRITERIA['min_price'] or volume < 100000:
-                    continue
-                
-                change_pct = ((current_price - prev_price) / prev_price) * 100 if prev_price > 0 else 0
-                
-                # Look for any significant movement or volume
-                avg_volume = sum(int(bar.get('v', 0)) for bar in bars) / len(bars) if bars else volume
-                volume_ratio = volume / avg_volume if avg_volume > 0 else 1.0
-                
-                # More inclusive criteria for comprehensive scan
-                if (abs(change_pct) > 0.1 or volume_ratio > 1.2):  # 0.1% move OR 20% volume increase
-                    opportunity = MarketOpportunity(
-                        symbol=symbol,
-                        discovery_source='comprehensive_scan',
-                        discovery_timestamp=datetime.now(),
-                        current_price=current_price,
-                        daily_change_pct=change_pct,
-                        volume=volume,
-                        avg_volume=avg_volume,
-                        volume_ratio=volume_ratio,
-                        market_cap=self._estimate_market_cap(symbol),
-                        sector=self._get_sector_from_universe(symbol),
-                    )
-                    opportunities.append(opportunity)
-                    
-            except Exception as e:
-                logger.debug(f"Failed to analyze {symbol} in comprehensive scan: {e}")
-                continue
-                
-        return opportunities
-    
     async def _get_dynamic_most_active(self) -> List[MarketOpportunity]:
         """Dynamic most active discovery using real volume data"""
         if not self.asset_universe:
@@ -877,74 +1074,56 @@ class IntelligentMarketFunnel:
         logger.info(f"🔍 Dynamic discovery: scanning for high volume from {len(self.asset_universe)} assets")
         
         # Sample from universe
-        candidate_symbols = []
-        for asset in self.asset_universe:
-            symbol = asset['symbol']
-            if (asset.get('exchange') in ['NYSE', 'NASDAQ', 'NYSEARCA'] and 
-                len(symbol) <= 4):
-                candidate_symbols.append(symbol)
-        
-        import random
+        candidate_symbols = self._get_universe_symbols('short')
+        
         sample_size = min(75, len(candidate_symbols))  # Fast execution - focus on high-quality candidates
-        test_symbols = random.sample(candidate_symbols, sample_size)
+        test_symbols = self._rng.choice(candidate_symbols, size=sample_size, replace=False).tolist()
         
         volume_candidates = []
         
-        for symbol in test_symbols:
-            try:
-                # Use supplemental data provider to avoid Alpaca rate limits
-                from supplemental_data_provider import SupplementalDataProvider
-                
-                data_provider = SupplementalDataProvider()
-                await data_provider.initialize()
-                
+        # One supplemental data provider for the whole scan (avoids Alpaca rate limits, shares its own limits)
+        data_provider = await self._new_data_provider()
+        try:
+            for symbol in test_symbols:
                 try:
-                    bars = await data_provider.get_historical_data(symbol, days=5, min_bars=3)
-                finally:
-                    await data_provider.shutdown()
-                if not bars or len(bars) < 3:
-                    continue
+                    bars = await self._cached_bars(data_provider, symbol, days=5, min_bars=3)
+                    if not bars or len(bars) < 3:
+                        continue
                     
-                current_volume = int(bars[-1].get('v', 0))
-                avg_prev_volume = sum(int(bar.get('v', 0)) for bar in bars[-4:-1]) / 3
-                
-                if current_volume > 0 and avg_prev_volume > 0:
-                    volume_ratio = current_volume / avg_prev_volume
-                    if volume_ratio > 1.5:  # 50% above average volume
-                        current_price = float(bars[-1].get('c', 0))
-                        prev_price = float(bars[-2].get('c', current_price))
-                        change_pct = ((current_price - prev_price) / prev_price) * 100 if prev_price > 0 else 0
+                    current_volume = int(bars[-1]['v'])
+                    avg_prev_volume = sum(map(_BAR_VOLUME, bars[-4:-1])) / 3
+                
+                    if current_volume > 0 and avg_prev_volume > 0:
+                        volume_ratio = current_volume / avg_prev_volume
+                        if volume_ratio > 1.5:  # 50% above average volume
+                            current_price = float(bars[-1]['c'])
+                            prev_price = float(bars[-2]['c'])
+                            change_pct = ((current_price - prev_price) / prev_price) * 100 if prev_price > 0 else 0
                         
-                        if current_price >= SCREENING_CRITERIA['min_price']:
-                            volume_candidates.append({
-                                'symbol': symbol,
-                                'volume': current_volume,
-                                'volume_ratio': volume_ratio,
-                                'price': current_price,
-                                'change_pct': change_pct
-                            })
+                            if current_price >= SCREENING_CRITERIA['min_price']:
+                                volume_candidates.append({
+                                    'symbol': symbol,
+                                    'volume': current_volume,
+                                    'volume_ratio': volume_ratio,
+                                    'price': current_price,
+                                    'change_pct': change_pct
+                                })
                             
-            except Exception as e:
-                logger.debug(f"Failed to analyze volume for {symbol}: {e}")
-                continue
+                except Exception as e:
+                    logger.debug(f"Failed to analyze volume for {symbol}: {e}")
+                    continue
+        finally:
+            await data_provider.shutdown()
         
         # Sort by volume ratio and take top candidates
         volume_candidates.sort(key=lambda x: x['volume_ratio'], reverse=True)
         
         opportunities = []
+        discovery_time = datetime.now()  # One timestamp for the whole batch
         for data in volume_candidates[:5]:  # Top 5 by volume
-            opportunity = MarketOpportunity(
-                symbol=data['symbol'],
-                discovery_source='dynamic_volume',
-                discovery_timestamp=datetime.now(),
-                current_price=data['price'],
-                daily_change_pct=data['change_pct'],
-                volume=data['volume'],
-                avg_volume=data['volume'] / data['volume_ratio'],
-                volume_ratio=data['volume_ratio'],
-                market_cap=self._estimate_market_cap(data['symbol']),
-                sector=self._get_sector_from_universe(data['symbol']),
-            )
+            opportunity = self._make_opportunity(data['symbol'], 'dynamic_volume', discovery_time, data['price'],
+                                                 data['change_pct'], data['volume'], data['volume_ratio'],
+                                                 universe_sector=True)
             opportunities.append(opportunity)
         
         logger.info(f"🎯 Dynamic volume: found {len(opportunities)} high-volume opportunities")
@@ -958,17 +1137,10 @@ class IntelligentMarketFunnel:
             return []
             
         # Sample from asset universe - focus on liquid, well-known symbols
-        candidate_symbols = []
-        for asset in self.asset_universe:
-            symbol = asset['symbol']
-            # Prefer major exchanges and avoid penny stocks
-            if (asset.get('exchange') in ['NYSE', 'NASDAQ'] and 
-                len(symbol) <= 4 and symbol.isalpha()):
-                candidate_symbols.append(symbol)
+        candidate_symbols = self._get_universe_symbols('listed')
         
         # Sample up to 20 symbols for testing
-        import random
-        test_symbols = random.sample(candidate_symbols, min(20, len(candidate_symbols)))
+        test_symbols = self._rng.choice(candidate_symbols, size=min(20, len(candidate_symbols)), replace=False).tolist()
         
         movers_data = []
         symbols_processed = 0
@@ -1029,19 +1201,10 @@ class IntelligentMarketFunnel:
             return []
             
         opportunities = []
+        discovery_time = datetime.now()  # One timestamp for the whole batch
         for data in movers_data:
-            opportunity = MarketOpportunity(
-                symbol=data['symbol'],
-                discovery_source=f'market_{direction}',
-                discovery_timestamp=datetime.now(),
-                current_price=data['price'],
-                daily_change_pct=data['change_pct'],
-                volume=data['volume'],
-                avg_volume=data['volume'] / 1.5,
-                volume_ratio=1.5,
-                market_cap=self._estimate_market_cap(data['symbol']),
-                sector=self._get_sector(data['symbol']),
-            )
+            opportunity = self._make_opportunity(data['symbol'], f'market_{direction}', discovery_time, data['price'],
+                                                 data['change_pct'], data['volume'], 1.5)
             opportunities.append(opportunity)
             
         return opportunities
@@ -1053,6 +1216,7 @@ class IntelligentMarketFunnel:
             active_data = await self.gateway.get_most_active_stocks(limit=25)
             
             opportunities = []
+            discovery_time = datetime.now()  # One timestamp for the whole batch
             for data in active_data:
                 # Parse real Alpaca API response
                 symbol = data.get('symbol', '')
@@ -1061,18 +1225,8 @@ class IntelligentMarketFunnel:
                 volume = int(data.get('volume', 0)) if data.get('volume') else 0
                 
                 if symbol and price > SCREENING_CRITERIA['min_price']:
-                    opportunity = MarketOpportunity(
-                        symbol=symbol,
-                        discovery_source='most_active',
-                        discovery_timestamp=datetime.now(),
-                        current_price=price,
-                        daily_change_pct=change_pct,
-                        volume=volume,
-                        avg_volume=volume / 2.0,  # Estimate from volume
-                        volume_ratio=2.0,
-                        market_cap=self._estimate_market_cap(symbol),
-                        sector=self._get_sector(symbol),
-                    )
+                    opportunity = self._make_opportunity(symbol, 'most_active', discovery_time, price,
+                                                         change_pct, volume, 2.0)
                     opportunities.append(opportunity)
                     
             # Fallback to dynamic discovery if API returns no data
@@ -1095,6 +1249,7 @@ class IntelligentMarketFunnel:
             
             opportunities = []
             processed_symbols = set()
+            discovery_time = datetime.now()  # One timestamp for the whole scan
             
             for news_item in news_data:
                 # Extract symbols from news
@@ -1105,29 +1260,9 @@ class IntelligentMarketFunnel:
                     if symbol in processed_symbols:
                         continue
                     
-                    # Skip crypto and forex symbols - comprehensive filtering
-                    crypto_patterns = ['USD', 'BTC', 'ETH', 'USDT', 'EUR', 'GBP', 'JPY', 'CRYPTO', 'COIN']
-                    if any(crypto in symbol.upper() for crypto in crypto_patterns):
-                        logger.debug(f"🚫 Filtered crypto/forex symbol: {symbol}")
-                        continue
-                        
-                    # Skip invalid or problematic symbols
-                    invalid_symbols = ['NDTAF', 'BRK.A', 'BRK.B']  # Common invalid/problematic symbols
-                    invalid_patterns = ['.A', '.B', 'TEST', 'TEMP']
-                    if (symbol in invalid_symbols or 
-                        any(pattern in symbol for pattern in invalid_patterns) or
-                        len(symbol) > 5 or len(symbol) < 1):
-                        logger.debug(f"🚫 Filtered invalid symbol: {symbol}")
-                        continue
-                        
-                    # Skip if symbol ends with USD (common crypto pattern)
-                    if symbol.upper().endswith('USD'):
-                        logger.debug(f"🚫 Filtered USD-ending symbol: {symbol}")
-                        continue
-                        
-                    # Skip if symbol is too long (likely crypto pair)
-                    if len(symbol) > 5:
-                        logger.debug(f"🚫 Filtered long symbol: {symbol}")
+                    # Skip crypto/forex and invalid or problematic symbols
+                    if _is_rejected_symbol(symbol):
+                        logger.debug("🚫 Filtered crypto/forex or invalid symbol: %s", symbol)
                         continue
                         
                     processed_symbols.add(symbol)
@@ -1145,19 +1280,9 @@ class IntelligentMarketFunnel:
                     # Determine catalyst from headline keywords
                     catalyst = self._extract_catalyst_from_headline(headline)
                     
-                    opportunity = MarketOpportunity(
-                        symbol=symbol,
-                        discovery_source='news_movers',
-                        discovery_timestamp=datetime.now(),
-                        current_price=current_price,
-                        daily_change_pct=0.0,  # Would need historical data to calculate
-                        volume=0,  # Would need volume data
-                        avg_volume=1000000,  # Estimate
-                        volume_ratio=3.0,  # Higher ratio for news-driven
-                        market_cap=self._estimate_market_cap(symbol),
-                        sector=self._get_sector(symbol),
-                        primary_catalyst=catalyst
-                    )
+                    # Change and volume would need historical data; higher ratio for news-driven
+                    opportunity = self._make_opportunity(symbol, 'news_movers', discovery_time, current_price,
+                                                         0.0, 0, 3.0, avg_volume=1000000, catalyst=catalyst)
                     opportunities.append(opportunity)
                     
                     if len(opportunities) >= 10:  # Limit to top 10
@@ -1182,68 +1307,58 @@ class IntelligentMarketFunnel:
             check_symbols = ['SPY', 'QQQ', 'IWM', 'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'NVDA', 'AMD', 
                            'META', 'NFLX', 'CRM', 'ROKU', 'ZM', 'SNAP', 'TWTR', 'UBER', 'LYFT', 'SQ']
             
-            volume_data = []
+            # One multi-symbol request, then the whole volume screen in NumPy
+            bars_by_symbol = await self.gateway.get_bars_bulk(check_symbols, timeframe='1Day', limit=10)
             
+            # Right-aligned (symbols, 10) matrices, NaN-padded where fewer than 10 bars came back
+            symbols = []
+            closes = np.full((len(check_symbols), 10), np.nan)
+            volumes = np.full((len(check_symbols), 10), np.nan)
             for symbol in check_symbols:
+                bars = bars_by_symbol.get(symbol)
+                if not bars or len(bars) < 5:
+                    continue
                 try:
-                    # Get recent bars to calculate average volume
-                    bars = await self.gateway.get_bars(symbol, '1Day', limit=10)
-                    if not bars or len(bars) < 5:
-                        continue
-                        
-                    # Calculate average volume from last 5-9 days (excluding today)
-                    historical_volumes = [int(bar.get('v', 0)) for bar in bars[:-1]]
-                    if not historical_volumes or all(v == 0 for v in historical_volumes):
-                        continue
-                        
-                    avg_volume = sum(historical_volumes) / len(historical_volumes)
-                    current_volume = int(bars[-1].get('v', 0))
-                    
-                    if avg_volume == 0 or current_volume == 0:
-                        continue
-                        
-                    volume_ratio = current_volume / avg_volume
-                    
-                    # Look for volume spikes (3x+ normal volume)
-                    if volume_ratio >= 3.0:
-                        current_price = float(bars[-1].get('c', 0))
-                        prev_close = float(bars[-2].get('c', current_price)) if len(bars) >= 2 else current_price
-                        change_pct = ((current_price - prev_close) / prev_close) * 100 if prev_close > 0 else 0
-                        
-                        if current_price >= SCREENING_CRITERIA['min_price']:
-                            volume_data.append({
-                                'symbol': symbol,
-                                'price': current_price,
-                                'change_pct': change_pct,
-                                'volume': current_volume,
-                                'volume_ratio': volume_ratio
-                            })
-                            
-                    if len(volume_data) >= 5:  # Limit results
-                        break
-                        
+                    row = len(symbols)
+                    closes[row, -len(bars):] = [float(bar.get('c', 0)) for bar in bars]
+                    volumes[row, -len(bars):] = [int(bar.get('v', 0)) for bar in bars]
+                    symbols.append(symbol)
                 except Exception as e:
                     logger.debug(f"Volume analysis failed for {symbol}: {e}")
-                    continue
+                    
+            closes = closes[:len(symbols)]
+            volumes = volumes[:len(symbols)]
+            
+            # Average volume from the previous 4-9 days (excluding today)
+            avg_volume = np.nanmean(volumes[:, :-1], axis=1) if symbols else np.empty(0)
+            current_volume = volumes[:, -1]
+            current_price = closes[:, -1]
+            prev_close = closes[:, -2]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                volume_ratio = current_volume / avg_volume
+                change_pct = np.where(prev_close > 0, (current_price - prev_close) / prev_close * 100, 0.0)
+                
+            # Volume spikes (3x+ normal volume) on tradeable prices
+            spikes = np.flatnonzero((avg_volume > 0) & (current_volume > 0) & (volume_ratio >= 3.0) &
+                                    (current_price >= SCREENING_CRITERIA['min_price']))
+            
+            volume_data = [{
+                'symbol': symbols[i],
+                'price': float(current_price[i]),
+                'change_pct': float(change_pct[i]),
+                'volume': int(current_volume[i]),
+                'volume_ratio': float(volume_ratio[i])
+            } for i in spikes[:5]]  # Limit results
                     
             if not volume_data:
                 logger.info("No unusual volume patterns detected")
                 return []
             
             opportunities = []
+            discovery_time = datetime.now()  # One timestamp for the whole batch
             for data in volume_data:
-                opportunity = MarketOpportunity(
-                    symbol=data['symbol'],
-                    discovery_source='unusual_volume',
-                    discovery_timestamp=datetime.now(),
-                    current_price=data['price'],
-                    daily_change_pct=data['change_pct'],
-                    volume=data['volume'],
-                    avg_volume=data['volume'] / data['volume_ratio'],
-                    volume_ratio=data['volume_ratio'],
-                    market_cap=self._estimate_market_cap(data['symbol']),
-                    sector=self._get_sector(data['symbol']),
-                )
+                opportunity = self._make_opportunity(data['symbol'], 'unusual_volume', discovery_time, data['price'],
+                                                     data['change_pct'], data['volume'], data['volume_ratio'])
                 opportunities.append(opportunity)
                 
             return opportunities
@@ -1258,18 +1373,11 @@ class IntelligentMarketFunnel:
             logger.warning("No asset universe available for most active simulation")
             return []
             
-        # Sample high-liquidity symbols from universe
-        candidate_symbols = []
-        for asset in self.asset_universe:
-            symbol = asset['symbol']
-            # Focus on major exchanges, ETFs, and well-known stocks
-            if (asset.get('exchange') in ['NYSE', 'NASDAQ', 'NYSEARCA'] and 
-                len(symbol) <= 4):
-                candidate_symbols.append(symbol)
+        # Sample high-liquidity symbols from universe (major exchanges, ETFs, and well-known stocks)
+        candidate_symbols = self._get_universe_symbols('short')
         
         # Sample for testing
-        import random
-        test_symbols = random.sample(candidate_symbols, min(8, len(candidate_symbols)))
+        test_symbols = self._rng.choice(candidate_symbols, size=min(8, len(candidate_symbols)), replace=False).tolist()
         
         active_data = []
         
@@ -1310,19 +1418,10 @@ class IntelligentMarketFunnel:
             return []
         
         opportunities = []
+        discovery_time = datetime.now()  # One timestamp for the whole batch
         for data in active_data:
-            opportunity = MarketOpportunity(
-                symbol=data['symbol'],
-                discovery_source='most_active',
-                discovery_timestamp=datetime.now(),
-                current_price=data['price'],
-                daily_change_pct=data['change_pct'],
-                volume=data['volume'],
-                avg_volume=data['volume'] / 2.0,
-                volume_ratio=2.0,
-                market_cap=self._estimate_market_cap(data['symbol']),
-                sector=self._get_sector(data['symbol']),
-            )
+            opportunity = self._make_opportunity(data['symbol'], 'most_active', discovery_time, data['price'],
+                                                 data['change_pct'], data['volume'], 2.0)
             opportunities.append(opportunity)
             
         return opportunities
@@ -1347,24 +1446,9 @@ class IntelligentMarketFunnel:
                     # Log all symbols being processed
                     logger.debug(f"Processing news symbol: {symbol}")
                         
-                    # Skip crypto and forex symbols - comprehensive filtering
-                    crypto_patterns = ['USD', 'BTC', 'ETH', 'USDT', 'EUR', 'GBP', 'JPY', 'CRYPTO', 'COIN']
-                    if any(crypto in symbol.upper() for crypto in crypto_patterns):
-                        logger.info(f"🚫 Filtered crypto/forex symbol: {symbol}")
-                        continue
-                        
-                    # Skip invalid or problematic symbols
-                    invalid_symbols = ['NDTAF', 'BRK.A', 'BRK.B']  # Common invalid/problematic symbols
-                    invalid_patterns = ['.A', '.B', 'TEST', 'TEMP']
-                    if (symbol in invalid_symbols or 
-                        any(pattern in symbol for pattern in invalid_patterns) or
-                        len(symbol) > 5 or len(symbol) < 1):
-                        logger.info(f"🚫 Filtered invalid symbol: {symbol}")
-                        continue
-                        
-                    # Skip if symbol ends with USD (common crypto pattern)
-                    if symbol.upper().endswith('USD'):
-                        logger.info(f"🚫 Filtered USD-ending symbol: {symbol}")
+                    # Skip crypto/forex and invalid or problematic symbols
+                    if _is_rejected_symbol(symbol):
+                        logger.info("🚫 Filtered crypto/forex or invalid symbol: %s", symbol)
                         continue
                         
                     processed_symbols.add(symbol)
@@ -1403,20 +1487,10 @@ class IntelligentMarketFunnel:
             return []
         
         opportunities = []
+        discovery_time = datetime.now()  # One timestamp for the whole batch
         for data in news_movers_data:
-            opportunity = MarketOpportunity(
-                symbol=data['symbol'],
-                discovery_source='news_movers',
-                discovery_timestamp=datetime.now(),
-                current_price=data['price'],
-                daily_change_pct=data['change_pct'],
-                volume=data['volume'],
-                avg_volume=data['volume'] / 3.0,
-                volume_ratio=3.0,
-                market_cap=self._estimate_market_cap(data['symbol']),
-                sector=self._get_sector(data['symbol']),
-                primary_catalyst=data['catalyst']
-            )
+            opportunity = self._make_opportunity(data['symbol'], 'news_movers', discovery_time, data['price'],
+                                                 data['change_pct'], data['volume'], 3.0, catalyst=data['catalyst'])
             opportunities.append(opportunity)
             
         return opportunities
@@ -1441,48 +1515,27 @@ class IntelligentMarketFunnel:
             
     def _deduplicate_candidates(self, candidates: List[MarketOpportunity]) -> List[MarketOpportunity]:
         """Remove duplicate symbols, keeping best discovery source"""
-        seen_symbols = {}
-        
-        # Priority order for discovery sources
-        source_priority = {
-            'market_gainers': 1,
-            'unusual_volume': 2,
-            'news_movers': 3,
-            'most_active': 4,
-            'market_losers': 5
-        }
+        best = {}  # symbol -> (source priority, candidate)
         
         for candidate in candidates:
-            symbol = candidate.symbol
-            current_priority = source_priority.get(candidate.discovery_source, 10)
-            
-            if (symbol not in seen_symbols or 
-                current_priority < source_priority.get(seen_symbols[symbol].discovery_source, 10)):
-                seen_symbols[symbol] = candidate
+            priority = _DISCOVERY_SOURCE_PRIORITY.get(candidate.discovery_source, 10)
+            seen = best.get(candidate.symbol)
+            if seen is None or priority < seen[0]:
+                best[candidate.symbol] = (priority, candidate)
                 
-        return list(seen_symbols.values())
+        return [candidate for _, candidate in best.values()]
         
     def _apply_basic_filters(self, candidates: List[MarketOpportunity]) -> List[MarketOpportunity]:
-        """Apply basic screening criteria"""
-        filtered = []
+        """Apply basic screening criteria (price range, average volume, market cap)"""
+        min_price = SCREENING_CRITERIA['min_price']
+        max_price = SCREENING_CRITERIA['max_price']
+        min_avg_volume = SCREENING_CRITERIA['min_avg_volume']
+        min_market_cap = SCREENING_CRITERIA['min_market_cap']
         
-        for candidate in candidates:
-            # Price filters
-            if (candidate.current_price < SCREENING_CRITERIA['min_price'] or
-                candidate.current_price > SCREENING_CRITERIA['max_price']):
-                continue
-                
-            # Volume filter
-            if candidate.avg_volume < SCREENING_CRITERIA['min_avg_volume']:
-                continue
-                
-            # Market cap filter
-            if candidate.market_cap < SCREENING_CRITERIA['min_market_cap']:
-                continue
-                
-            filtered.append(candidate)
-            
-        return filtered
+        return [candidate for candidate in candidates
+                if min_price <= candidate.current_price <= max_price
+                and candidate.avg_volume >= min_avg_volume
+                and candidate.market_cap >= min_market_cap]
         
     async def _get_market_regime_analysis(self) -> Dict:
         """Get AI analysis of current market regime"""
@@ -1616,40 +1669,60 @@ class IntelligentMarketFunnel:
                 'options_flow': 'unknown'
             }
         
-    def _meets_regime_criteria(self, candidate: MarketOpportunity, regime_criteria: Dict) -> bool:
-        """Check if candidate meets market regime criteria"""
-        try:
-            # Focus criteria - use dynamic thresholds from config
-            focus = regime_criteria.get('focus_on', 'all')
-            min_daily_change = regime_criteria.get('min_daily_change', 0.0)
-            
-            if focus == 'gainers' and candidate.daily_change_pct < min_daily_change:
-                return False
-            elif focus == 'oversold_bounces' and candidate.daily_change_pct > min_daily_change:
-                return False
-                
-            # Volume ratio check
-            min_volume_ratio = regime_criteria.get('min_volume_ratio', 1.0)
-            if candidate.volume_ratio < min_volume_ratio:
-                return False
-                
-            # Sector preference
-            preferred_sectors = regime_criteria.get('preferred_sectors', [])
-            avoid_sectors = regime_criteria.get('avoid_sectors', [])
-            
-            if preferred_sectors and 'ALL' not in preferred_sectors:
-                if candidate.sector not in preferred_sectors:
+    def _compile_regime_check(self, regime_criteria: Dict) -> Callable[[MarketOpportunity], bool]:
+        """
+        Build the regime criteria check for one regime's criteria
+        Thresholds and sector sets are resolved once instead of per candidate
+        """
+        focus = regime_criteria.get('focus_on', 'all')
+        min_daily_change = regime_criteria.get('min_daily_change', 0.0)
+        min_volume_ratio = regime_criteria.get('min_volume_ratio', 1.0)
+        preferred_sectors = regime_criteria.get('preferred_sectors', [])
+        preferred = (frozenset(preferred_sectors) 
+                     if preferred_sectors and 'ALL' not in preferred_sectors else None)
+        avoid = frozenset(regime_criteria.get('avoid_sectors', []))
+        gainers_only = focus == 'gainers'
+        oversold_only = focus == 'oversold_bounces'
+        
+        def check(candidate: MarketOpportunity) -> bool:
+            try:
+                if gainers_only and candidate.daily_change_pct < min_daily_change:
                     return False
-                    
-            if candidate.sector in avoid_sectors:
-                return False
+                if oversold_only and candidate.daily_change_pct > min_daily_change:
+                    return False
+                if candidate.volume_ratio < min_volume_ratio:
+                    return False
+                if preferred is not None and candidate.sector not in preferred:
+                    return False
+                return candidate.sector not in avoid
+            except Exception as e:
+                logger.error(f"Regime criteria check failed: {e}")
+                return True
                 
-            return True
-            
-        except Exception as e:
-            logger.error(f"Regime criteria check failed: {e}")
-            return True
-            
+        return check
+        
+    def _calculate_preliminary_scores(self, candidates: List[MarketOpportunity],
+                                      market_context: Dict, regime_criteria: Dict) -> np.ndarray:
+        """Vectorized _calculate_preliminary_score over a list of candidates"""
+        n = len(candidates)
+        try:
+            volume_ratio = np.fromiter((c.volume_ratio for c in candidates), dtype=np.float64, count=n)
+            daily_change = np.fromiter((c.daily_change_pct for c in candidates), dtype=np.float64, count=n)
+            market_cap = np.fromiter((c.market_cap for c in candidates), dtype=np.float64, count=n)
+            source_score = np.fromiter((_SOURCE_SCORES.get(c.discovery_source, 0.1) for c in candidates),
+                                       dtype=np.float64, count=n)
+        except (TypeError, ValueError):
+            # Missing or non-numeric fields - score one by one so each failure falls back to 0.5
+            return np.array([self._calculate_preliminary_score(c, market_context, regime_criteria)
+                             for c in candidates], dtype=np.float64)
+        
+        # Same components as _calculate_preliminary_score (fmin matches min() when a value is NaN)
+        score = np.fmin(0.3, volume_ratio * 0.1)
+        score += np.fmin(0.3, np.abs(daily_change) * 0.03)
+        score += np.where(market_cap > 10e9, 0.2, np.where(market_cap > 1e9, 0.15, 0.1))
+        score += source_score
+        return np.fmin(1.0, score)
+        
     def _calculate_preliminary_score(self, candidate: MarketOpportunity, 
                                    market_context: Dict, regime_criteria: Dict) -> float:
         """Calculate preliminary opportunity score"""
@@ -1674,14 +1747,7 @@ class IntelligentMarketFunnel:
                 score += 0.1
                 
             # Discovery source score (0-0.2)
-            source_scores = {
-                'market_gainers': 0.2,
-                'news_movers': 0.18,
-                'unusual_volume': 0.15,
-                'most_active': 0.12,
-                'market_losers': 0.1
-            }
-            score += source_scores.get(candidate.discovery_source, 0.1)
+            score += _SOURCE_SCORES.get(candidate.discovery_source, 0.1)
             
             return min(1.0, score)
             
@@ -1689,20 +1755,35 @@ class IntelligentMarketFunnel:
             logger.error(f"Preliminary scoring failed: {e}")
             return 0.5
             
-    async def _get_detailed_technicals(self, symbol: str) -> Optional[Dict]:
-        """Get detailed technical analysis data"""
+    async def _get_bulk_technicals(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get detailed technicals for all symbols from one multi-symbol daily bars request"""
         try:
-            # Simulate technical data retrieval
-            return {
-                'rsi': np.random.uniform(30, 70),
-                'ma_10': np.random.uniform(100, 200),
-                'ma_20': np.random.uniform(95, 195),
-                'ma_50': np.random.uniform(90, 190),
-                'atr': np.random.uniform(2, 8)
-            }
+            bars_by_symbol = await self.gateway.get_bars_bulk(symbols, timeframe='1Day', limit=60)
         except Exception as e:
-            logger.error(f"Technical analysis failed for {symbol}: {e}")
-            return None
+            logger.error(f"Bulk technicals request failed: {e}")
+            return {}
+            
+        technicals = {}
+        for symbol, bars in bars_by_symbol.items():
+            if len(bars) < 15:
+                continue  # Not enough history for RSI/ATR
+            try:
+                close = np.fromiter((bar['c'] for bar in bars), dtype=np.float64, count=len(bars))
+                high = np.fromiter((bar['h'] for bar in bars), dtype=np.float64, count=len(bars))
+                low = np.fromiter((bar['l'] for bar in bars), dtype=np.float64, count=len(bars))
+                
+                rsi, ma_10, ma_20, ma_50, atr = _latest_technicals_kernel(close, high, low)
+                technicals[symbol] = {
+                    'rsi': rsi,
+                    'ma_10': ma_10,
+                    'ma_20': None if np.isnan(ma_20) else ma_20,
+                    'ma_50': None if np.isnan(ma_50) else ma_50,
+                    'atr': atr
+                }
+            except (KeyError, TypeError, ValueError) as e:
+                logger.debug(f"Technical analysis failed for {symbol}: {e}")
+                
+        return technicals
             
     async def _get_news_analysis(self, symbol: str) -> Optional[Dict]:
         """Get news analysis for symbol"""
@@ -1825,115 +1906,62 @@ class IntelligentMarketFunnel:
         return False
         
     # Helper methods for dynamic data lookups
+    def _make_opportunity(self, symbol: str, source: str, discovery_time: datetime, price: float,
+                          change_pct: float, volume: int, volume_ratio: float,
+                          avg_volume: Optional[float] = None, catalyst: str = "",
+                          universe_sector: bool = False) -> MarketOpportunity:
+        """
+        Build a discovered opportunity (avg_volume defaults to volume / volume_ratio)
+        universe_sector classifies from the asset universe entry instead of the symbol tables
+        """
+        return MarketOpportunity(
+            symbol=symbol,
+            discovery_source=source,
+            discovery_timestamp=discovery_time,
+            current_price=price,
+            daily_change_pct=change_pct,
+            volume=volume,
+            avg_volume=volume / volume_ratio if avg_volume is None else avg_volume,
+            volume_ratio=volume_ratio,
+            market_cap=self._estimate_market_cap(symbol),
+            sector=self._get_sector_from_universe(symbol) if universe_sector else self._get_sector(symbol),
+            primary_catalyst=catalyst
+        )
+        
     def _estimate_market_cap(self, symbol: str) -> float:
         """Estimate market cap based on symbol characteristics and price"""
-        try:
-            # ETF market caps are not applicable - return 0
-            if symbol in ['SPY', 'QQQ', 'IWM', 'XLF', 'XLK', 'XLE', 'XLV', 'XLI', 'XLP', 'XLY', 'XLU', 'XLB', 'XLRE']:
-                return 0
-                
-            # For stocks, estimate based on typical market cap ranges by symbol characteristics
-            # Large cap tech (typically >$500B)
-            large_cap_tech = ['AAPL', 'MSFT', 'GOOGL', 'GOOG', 'AMZN']
-            if symbol in large_cap_tech:
-                return 2000000000000  # $2T estimate
-                
-            # Major tech stocks (typically $100B-$1T)
-            major_tech = ['NVDA', 'META', 'TSLA', 'NFLX', 'CRM', 'ADBE', 'ORCL', 'INTC', 'AMD', 'QCOM']
-            if symbol in major_tech:
-                return 500000000000  # $500B estimate
-                
-            # Mid-cap stocks (typically $10B-$100B)
-            mid_cap_indicators = len(symbol) <= 4 and not any(char.isdigit() for char in symbol)
-            if mid_cap_indicators:
-                return 50000000000  # $50B estimate
-                
-            # Small-cap default
-            return 10000000000  # $10B estimate
-            
-        except Exception as e:
-            logger.debug(f"Market cap estimation failed for {symbol}: {e}")
-            return 25000000000  # Default $25B
+        return _estimate_market_cap_for(symbol)
         
     def _get_sector_from_universe(self, symbol: str) -> str:
         """Get sector from asset universe data"""
-        for asset in self.asset_universe:
-            if asset['symbol'] == symbol:
-                # Use exchange as a proxy for sector classification
-                exchange = asset.get('exchange', '')
-                if exchange == 'NYSEARCA':
-                    return 'EQUITY'  # ETFs
-                elif 'name' in asset:
-                    name = asset['name'].upper()
-                    if any(tech in name for tech in ['TECH', 'SOFTWARE', 'COMPUTER', 'DATA']):
-                        return 'TECHNOLOGY'
-                    elif any(health in name for health in ['HEALTH', 'PHARMA', 'BIO', 'MEDICAL']):
-                        return 'HEALTHCARE'
-                    elif any(fin in name for fin in ['BANK', 'FINANCIAL', 'INSURANCE']):
-                        return 'FINANCIAL'
-                    else:
-                        return 'EQUITY'
-                return 'EQUITY'
-        return 'UNKNOWN'
+        # Classify the universe once per refresh instead of per lookup
+        if self._universe_sectors is None or self._universe_sectors_source is not self.asset_universe:
+            self._universe_sectors = {}
+            for asset in self.asset_universe:
+                if asset['symbol'] not in self._universe_sectors:  # First listing wins, as in a linear scan
+                    self._universe_sectors[asset['symbol']] = _sector_from_asset(asset)
+            self._universe_sectors_source = self.asset_universe
+            
+        return self._universe_sectors.get(symbol, 'UNKNOWN')
+    
+    def _get_universe_symbols(self, name: str) -> np.ndarray:
+        """Universe symbols passing a named _UNIVERSE_FILTERS predicate, as a shared array for Generator sampling"""
+        if self._universe_symbols_source is not self.asset_universe:
+            self._universe_symbols = {}
+            self._universe_symbols_source = self.asset_universe
+            
+        symbols = self._universe_symbols.get(name)
+        if symbols is None:
+            predicate = _UNIVERSE_FILTERS[name]
+            # Object array so sampling returns the original str objects
+            symbols = np.array([asset['symbol'] for asset in self.asset_universe
+                                if predicate(asset['symbol'], asset.get('exchange'))], dtype=object)
+            self._universe_symbols[name] = symbols
+        return symbols
     
     def _get_sector(self, symbol: str) -> str:
         """Get sector classification based on symbol characteristics"""
-        try:
-            # ETFs
-            if symbol in ['SPY', 'QQQ', 'IWM', 'DIA', 'VTI', 'VOO']:
-                return 'ETF'
-            
-            # Sector ETFs
-            sector_etfs = {
-                'XLK': 'TECHNOLOGY_ETF',
-                'XLF': 'FINANCIALS_ETF', 
-                'XLE': 'ENERGY_ETF',
-                'XLV': 'HEALTHCARE_ETF',
-                'XLI': 'INDUSTRIALS_ETF',
-                'XLP': 'CONSUMER_STAPLES_ETF',
-                'XLY': 'CONSUMER_DISCRETIONARY_ETF',
-                'XLU': 'UTILITIES_ETF',
-                'XLB': 'MATERIALS_ETF',
-                'XLRE': 'REAL_ESTATE_ETF'
-            }
-            if symbol in sector_etfs:
-                return sector_etfs[symbol]
-                
-            # Major technology companies
-            tech_companies = ['AAPL', 'MSFT', 'GOOGL', 'GOOG', 'AMZN', 'META', 'NVDA', 'AMD', 'INTC', 
-                            'CRM', 'ORCL', 'ADBE', 'NFLX', 'ROKU', 'ZM', 'SNAP', 'TWTR', 'SQ', 'PYPL']
-            if symbol in tech_companies:
-                return 'TECHNOLOGY'
-                
-            # Automotive/EV
-            auto_companies = ['TSLA', 'F', 'GM', 'NIO', 'XPEV', 'LI', 'RIVN', 'LCID']
-            if symbol in auto_companies:
-                return 'AUTOMOTIVE'
-                
-            # Financial services
-            financial_companies = ['JPM', 'BAC', 'WFC', 'C', 'GS', 'MS', 'AXP', 'BRK.A', 'BRK.B']
-            if symbol in financial_companies:
-                return 'FINANCIALS'
-                
-            # Healthcare/Biotech
-            healthcare_companies = ['JNJ', 'PFE', 'UNH', 'ABBV', 'TMO', 'ABT', 'MRK', 'LLY', 'GILD', 'AMGN']
-            if symbol in healthcare_companies:
-                return 'HEALTHCARE'
-                
-            # Energy
-            energy_companies = ['XOM', 'CVX', 'COP', 'EOG', 'SLB', 'MPC', 'VLO', 'PSX']
-            if symbol in energy_companies:
-                return 'ENERGY'
-                
-            # Default classification based on symbol patterns
-            if len(symbol) <= 4 and symbol.isalpha():
-                return 'EQUITY'  # Generic equity
-            
-            return 'OTHER'
-            
-        except Exception as e:
-            logger.debug(f"Sector classification failed for {symbol}: {e}")
-            return 'UNKNOWN'
+        return _sector_for(symbol)
         
     async def get_current_opportunities(self) -> List[MarketOpportunity]:
         """Get current watchlist opportunities sorted by score"""
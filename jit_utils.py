@@ -0,0 +1,44 @@
+"""
+Optional Numba JIT support for numeric hot paths
+Falls back to plain Python/NumPy execution when numba is not installed
+
+@njit(cache=True) kernels are cached in Numba's default location (__pycache__ next to the sources);
+export NUMBA_CACHE_DIR before starting the bot to keep the cache elsewhere (opt-in, e.g. ./.numba_cache)
+"""
+
+import importlib
+import logging
+import os
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports both @njit and @njit(...))"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+logger = logging.getLogger(__name__)
+
+
+def load_aot_module(module_name: str, source_path: str):
+    """
+    Import an ahead-of-time compiled kernel module built by build_aot.py
+    Returns None if it is missing or older than the source it was compiled from
+    """
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:
+        return None
+
+    if os.path.getmtime(module.__file__) < os.path.getmtime(source_path):
+        logger.warning(f"⚠️ {module_name} is older than {os.path.basename(source_path)} - "
+                       f"using JIT kernels (re-run build_aot.py)")
+        return None
+
+    return module
@@ -65,7 +65,7 @@ class IntelligentTradingSystem:
         self.order_executor = SimpleTradeExecutor(self.gateway, self.risk_manager)
         # Note: PDT manager will be linked after initialization
         self.performance_tracker = None  # Will be initialized after gateway
-        self.corporate_actions_filter = CorporateActionsFilter()
+        self.corporate_actions_filter = CorporateActionsFilter(data_provider=self.supplemental_data)
         self.alerter = CriticalAlerter()  # CRITICAL: Emergency alerting system
         self.pdt_manager = PDTManager()  # CRITICAL: PDT rule compliance
         self.gap_risk_manager = GapRiskManager()  # CRITICAL: Extended hours gap protection
@@ -140,6 +140,9 @@ class IntelligentTradingSystem:
             await self.supplemental_data.initialize()
             self.logger.info("✅ Supplemental Data Provider online")
             
+            # Start corporate actions background maintenance
+            await self.corporate_actions_filter.initialize()
+            
             # Validate account and trading permissions
             account = await self.gateway.get_account_safe()
             if not account:
@@ -1655,6 +1658,9 @@ class IntelligentTradingSystem:
             if existing_symbols:
                 self.logger.info(f"🔒 Existing positions: {', '.join(existing_symbols)} - will skip these symbols")
             
+            # One timestamp for every signal generated in this scan
+            scan_timestamp = datetime.now()
+            
             for opportunity in self.active_opportunities[:10]:  # Process top 10
                 try:
                     # SKIP if we already have a position in this symbol
@@ -1678,7 +1684,6 @@ class IntelligentTradingSystem:
                     quote_data = None
                     
                     # Strategy 1: Try Alpaca first (limited on free tier)
-                    from datetime import datetime, timedelta
                     end_date = datetime.now()
                     start_date = end_date - timedelta(days=30)
                     
@@ -1751,7 +1756,8 @@ class IntelligentTradingSystem:
                     # Generate technical signal with enhanced data context and market intelligence
                     technical_signal = await self.strategy_engine.analyze_symbol(
                         opportunity.symbol, bars, quote_data=quote_data, 
-                        data_sources=data_sources_tried, market_intelligence=self.current_intelligence
+                        data_sources=data_sources_tried, market_intelligence=self.current_intelligence,
+                        tick_timestamp=scan_timestamp
                     )
                     
                     if technical_signal:
@@ -2585,12 +2591,17 @@ class IntelligentTradingSystem:
             
             # Send alerts for significant gap moves with AI decision making (with deduplication)
             if gap_risk_alerts:
-                for alert in gap_risk_alerts:
-                    # Create gap risk alert object for deduplication check
-                    gap_alert = self.gap_risk_manager.calculate_gap_risk(
-                        alert['symbol'],
-                        alert['current_price']
+                # Gap risk for all moved positions in one vectorized pass (only significant gaps are returned)
+                gap_alerts = {
+                    gap_alert.symbol: gap_alert
+                    for gap_alert in self.gap_risk_manager.calculate_gap_risks_batch(
+                        [alert['symbol'] for alert in gap_risk_alerts],
+                        [alert['current_price'] for alert in gap_risk_alerts]
                     )
+                }
+                for alert in gap_risk_alerts:
+                    # Gap risk alert object for deduplication check
+                    gap_alert = gap_alerts.get(alert['symbol'])
                     
                     # Only proceed if this alert should be sent (prevents spam)
                     if gap_alert and self.gap_risk_manager.should_alert_gap_risk(gap_alert):
@@ -3048,6 +3059,10 @@ class IntelligentTradingSystem:
             if self.gateway:
                 shutdown_tasks.append(self.gateway.shutdown())
                 
+            # Close the market funnel's pooled HTTP session
+            if self.market_funnel:
+                shutdown_tasks.append(self.market_funnel.shutdown())
+                
             # Close supplemental data provider
             if self.supplemental_data:
                 try:
@@ -3055,6 +3070,10 @@ class IntelligentTradingSystem:
                 except Exception as e:
                     self.logger.warning(f"⚠️ Supplemental data shutdown warning: {e}")
             
+            # Stop corporate actions background cleanup
+            if self.corporate_actions_filter:
+                shutdown_tasks.append(self.corporate_actions_filter.shutdown())
+            
             # Wait for all shutdown tasks to complete
             if shutdown_tasks:
                 await asyncio.gather(*shutdown_tasks, return_exceptions=True)
@@ -3234,7 +3253,7 @@ class IntelligentTradingSystem:
                 close_price = float(day_group[-1].get('c', 0))
                 high_price = max(float(bar.get('h', 0)) for bar in day_group)
                 low_price = min(float(bar.get('l', 0)) for bar in day_group if float(bar.get('l', 0)) > 0)
-                total_volume = sum(int(bar.get('v', 0)) for bar in day_group)
+                total_volume = sum([int(bar.get('v', 0)) for bar in day_group])
                 
                 if open_price > 0 and close_price > 0 and high_price > 0 and low_price > 0:
                     daily_bars.append({
@@ -105,6 +105,14 @@ fi
 
 print_status "TA-Lib installation attempted ✓"
 
+# Warm the Numba JIT cache so the first scan does not pay JIT compile time
+print_step "Warming Numba signal kernel cache..."
+if python build_aot.py; then
+    print_status "Signal kernel cache warmed ✓"
+else
+    print_warning "Kernel cache warm-up failed - kernels will JIT-compile on first use"
+fi
+
 # Setup Ollama
 print_step "Setting up Ollama for AI analysis..."
 if ! command -v ollama &> /dev/null; then
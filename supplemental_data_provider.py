@@ -13,6 +13,12 @@ import time
 import random
 import string
 
+try:
+    import orjson  # Optional: 2-4x faster JSON parsing for large payloads
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 class SupplementalDataProvider:
@@ -20,8 +26,13 @@ class SupplementalDataProvider:
     Provides historical data from free sources when Alpaca data is insufficient
     """
     
-    def __init__(self):
-        self.session = None
+    # Data-source setup is logged once per process, not once per provider instance
+    _keys_initialized = False
+    
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        # A caller-provided session is shared (connection pool reuse) and left open on shutdown
+        self.session = session
+        self._owns_session = session is None
         
         # Alpha Vantage dynamic key management - AGGRESSIVE MODE
         self.alphavantage_keys = []  # Start empty, will generate keys as needed
@@ -48,13 +59,14 @@ class SupplementalDataProvider:
         
     async def initialize(self):
         """Initialize HTTP session and generate initial Alpha Vantage keys"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            headers={'User-Agent': 'TradingBot/1.0'}
-        )
+        if self._owns_session:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers={'User-Agent': 'TradingBot/1.0'}
+            )
         
         # Optional Alpha Vantage key generation (Yahoo Finance is primary)
-        if not hasattr(self, '_keys_initialized'):
+        if not SupplementalDataProvider._keys_initialized:
             logger.info("🔑 Yahoo Finance is primary data source (sustainable 1500/hour limit)")
             logger.info("🔑 Alpha Vantage key generation available if needed...")
             
@@ -62,12 +74,12 @@ class SupplementalDataProvider:
             # Commenting out automatic generation to focus on sustainable Yahoo usage
             # self.alphavantage_keys.append("demo")  # Keep demo key as backup
             
-            self._keys_initialized = True
+            SupplementalDataProvider._keys_initialized = True
         
     async def shutdown(self):
         """Clean shutdown"""
         try:
-            if self.session and not self.session.closed:
+            if self._owns_session and self.session and not self.session.closed:
                 await self.session.close()
                 logger.info("✅ Supplemental data provider session closed cleanly")
         except Exception as e:
@@ -110,7 +122,10 @@ class SupplementalDataProvider:
                     logger.debug(f"Alpha Vantage failed for {symbol}: {e}")
                     
             # Strategy 3: Try alternative Yahoo Finance with different parameters
-            if not yahoo_data:
+            # (it is not rate limited itself, so it must not bypass a spent Yahoo budget)
+            if not yahoo_data and self._yahoo_budget_spent():
+                logger.debug(f"Yahoo Finance budget spent, skipping alternative method for {symbol}")
+            elif not yahoo_data:
                 try:
                     yahoo_data = await self._get_yahoo_data_alternative(symbol, days)
                     if yahoo_data and len(yahoo_data) >= min_bars:
@@ -132,6 +147,14 @@ class SupplementalDataProvider:
             logger.error(f"Supplemental data fetch failed for {symbol}: {e}")
             return []
             
+    async def get_last_n_bars(self, symbol: str, n: int = 2) -> List[Dict]:
+        """
+        Get only the most recent n daily bars for a symbol
+        Requests a short calendar window (padded for weekends/holidays) instead of the full history
+        """
+        bars = await self.get_historical_data(symbol, days=n + 5, min_bars=n)
+        return bars[-n:] if len(bars) > n else bars
+            
     async def _get_yahoo_data(self, symbol: str, days: int = 30) -> List[Dict]:
         """Get data from Yahoo Finance (free, no API key needed)"""
         try:
@@ -219,6 +242,12 @@ class SupplementalDataProvider:
             
         return []
         
+    def _yahoo_budget_spent(self) -> bool:
+        """True once any Yahoo Finance limit tier is used up (call windows are pruned in _get_yahoo_data)"""
+        return (len(self.yahoo_calls_this_minute) >= self.yahoo_minute_limit or
+                len(self.yahoo_calls_this_hour) >= self.yahoo_hourly_limit or
+                self.yahoo_daily_calls >= self.yahoo_daily_limit)
+        
     async def _get_alphavantage_data(self, symbol: str) -> List[Dict]:
         """Get data from Alpha Vantage (500 free calls/day)"""
         try:
@@ -247,7 +276,7 @@ class SupplementalDataProvider:
             
             async with self.session.get(url) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = _json_loads(await response.read())
                     
                     if 'Time Series (Daily)' in data:
                         time_series = data['Time Series (Daily)']
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test that batch symbol analysis matches per-symbol analysis
+Covers the limited-data kernel run across symbols and the grouped indicator pass
+"""
+
+import asyncio
+import logging
+import random
+import sys
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from enhanced_momentum_strategy import EventDrivenMomentumStrategy
+
+STRATEGY_MODES = ["MOMENTUM", "BREAKOUT", "MEAN_REVERSION", "DEFENSIVE"]
+BAR_COUNTS = [5, 8, 12, 14, 20, 30, 60, 90]
+
+def _make_bars(rng: random.Random, count: int, trend: float) -> list:
+    """Fresh daily bars ending today with a random walk around the given trend"""
+    now = datetime.now(timezone.utc)
+    price = rng.uniform(5, 200)
+    bars = []
+    for i in range(count):
+        price *= 1 + rng.gauss(trend, 0.02)
+        volume = rng.randint(100000, 5000000)
+        if i == count - 1 and rng.random() < 0.5:
+            volume *= 3  # Volume spike on the latest bar
+        bars.append({
+            't': (now - timedelta(days=count - 1 - i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'o': price,
+            'h': price * (1 + abs(rng.gauss(0, 0.01))),
+            'l': price * (1 - abs(rng.gauss(0, 0.01))),
+            'c': price,
+            'v': volume
+        })
+    return bars
+
+def _make_universe(rng: random.Random, size: int = 60):
+    """Symbols with mixed bar counts, about half with a fresh quote"""
+    symbols_bars = {}
+    quotes = {}
+    for i in range(size):
+        symbol = f"SYM{i}"
+        bars = _make_bars(rng, rng.choice(BAR_COUNTS), rng.choice([-0.01, 0.0, 0.01, 0.02]))
+        symbols_bars[symbol] = bars
+        if rng.random() < 0.5:
+            close = bars[-1]['c']
+            quotes[symbol] = {
+                'bid': close * 0.999,
+                'ask': close * 1.001,
+                'price': close,
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            }
+    return symbols_bars, quotes
+
+def test_batch_matches_single_analysis():
+    """analyze_symbols_batch returns exactly the signals analyze_symbol produces per symbol"""
+    rng = random.Random(7)
+    tick_timestamp = datetime.now()
+    limited_signals = full_signals = 0
+
+    for mode in STRATEGY_MODES:
+        for _ in range(4):
+            symbols_bars, quotes = _make_universe(rng)
+            single_strategy = EventDrivenMomentumStrategy()
+            batch_strategy = EventDrivenMomentumStrategy()
+            single_strategy.active_strategy_mode = batch_strategy.active_strategy_mode = mode
+
+            single = {}
+            for symbol, bars in symbols_bars.items():
+                signal = asyncio.run(single_strategy.analyze_symbol(
+                    symbol, bars, quote_data=quotes.get(symbol), tick_timestamp=tick_timestamp))
+                if signal:
+                    single[symbol] = asdict(signal)
+
+            batch = asyncio.run(batch_strategy.analyze_symbols_batch(
+                symbols_bars, quotes, tick_timestamp=tick_timestamp))
+            batch = {symbol: asdict(signal) for symbol, signal in batch.items()}
+
+            assert single == batch, f"{mode}: batch signals differ for {set(single) ^ set(batch) or 'matching symbols'}"
+            assert single_strategy.signals_generated == batch_strategy.signals_generated
+
+            for symbol in single:
+                if len(symbols_bars[symbol]) < 15:
+                    limited_signals += 1
+                else:
+                    full_signals += 1
+
+    # Both the limited-data kernel and the full indicator path must actually be exercised
+    assert limited_signals > 0 and full_signals > 0
+    print(f"✅ Batch analysis matches single analysis ({limited_signals} limited-data, {full_signals} full signals)")
+
+def main():
+    """Run the test"""
+    logging.basicConfig(level=logging.CRITICAL)
+    print("🧪 Testing batch symbol analysis...")
+    test_batch_matches_single_analysis()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test batch gap risk calculation and duplicate alert suppression
+"""
+
+import random
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gap_risk_manager import GapRiskManager
+
+def _position(symbol: str, qty: float, close_price: float):
+    """Alpaca-style position (string fields) with a market value at the given close"""
+    return SimpleNamespace(symbol=symbol, qty=str(qty), market_value=str(qty * close_price))
+
+def _without_timestamp(alert) -> dict:
+    fields = asdict(alert)
+    del fields['timestamp']
+    return fields
+
+def test_batch_matches_single_calculation():
+    """calculate_gap_risks_batch returns calculate_gap_risk's alert for every symbol gapping 2% or more"""
+    rng = random.Random(11)
+    manager = GapRiskManager()
+    positions = [_position(f"SYM{i}", rng.choice([-1, 1]) * rng.randint(1, 500), rng.uniform(5, 500))
+                 for i in range(200)]
+    manager.record_market_close_positions(positions)
+
+    # Include unknown symbols and gaps on every risk bin (including exact thresholds)
+    symbols = [p.symbol for p in positions] + ["UNKNOWN1", "UNKNOWN2"]
+    prices = []
+    for symbol in symbols:
+        close = manager.position_closes.get(symbol, {'close_price': 100.0})['close_price']
+        gap = rng.choice([0.0, 1.5, 2.0, -2.0, 3.7, 5.0, -7.5, 10.0, 14.0, -25.0])
+        prices.append(close * (1 + gap / 100))
+
+    batch = {alert.symbol: _without_timestamp(alert)
+             for alert in manager.calculate_gap_risks_batch(symbols, prices)}
+
+    expected = {}
+    for symbol, price in zip(symbols, prices):
+        alert = manager.calculate_gap_risk(symbol, price)
+        if alert and alert.risk_level != 'LOW':
+            expected[symbol] = _without_timestamp(alert)
+
+    assert batch == expected
+    assert {alert['risk_level'] for alert in batch.values()} == {'MODERATE', 'HIGH', 'EXTREME'}
+    print(f"✅ Batch gap risk matches single calculation ({len(batch)} alerts)")
+
+def test_dedup_survives_second_record_call():
+    """Alerts already sent stay suppressed after positions are recorded again the same day"""
+    manager = GapRiskManager()
+    manager.record_market_close_positions([_position("AAA", 10, 100.0), _position("BBB", 5, 50.0)])
+
+    first = manager.calculate_gap_risks_batch(["AAA", "BBB"], [106.0, 47.0])
+    assert [manager.should_alert_gap_risk(alert) for alert in first] == [True, True]
+
+    # Re-record with a new position first in the list and an existing one updated
+    manager.record_market_close_positions([_position("CCC", 3, 20.0), _position("BBB", 8, 50.0)])
+
+    again = manager.calculate_gap_risks_batch(["AAA", "BBB", "CCC"], [106.0, 47.0, 21.0])
+    decisions = {alert.symbol: manager.should_alert_gap_risk(alert) for alert in again}
+    assert decisions == {"AAA": False, "BBB": False, "CCC": True}
+
+    # A higher risk level for an alerted symbol is a new alert
+    escalated = manager.calculate_gap_risks_batch(["AAA"], [112.0])
+    assert escalated[0].risk_level == 'EXTREME'
+    assert manager.should_alert_gap_risk(escalated[0])
+    assert manager.alerts_sent_count() == 4
+    print("✅ Gap alert suppression survives repeated close recording")
+
+def main():
+    """Run the tests"""
+    print("🧪 Testing gap risk batch calculation...")
+    test_batch_matches_single_calculation()
+    test_dedup_survives_second_record_call()
+
+if __name__ == "__main__":
+    main()
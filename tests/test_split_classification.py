@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test the pure split ratio and overnight gap classifiers used by the corporate actions filter
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from corporate_actions_filter import classify_split_ratio, is_unusual_gap
+
+def _reference_split_ratio(yesterday_close: float, today_open: float):
+    """The original inline if/elif chain from _detect_potential_split"""
+    if yesterday_close > 0 and today_open > 0:
+        price_drop_pct = (yesterday_close - today_open) / yesterday_close
+        if 0.45 < price_drop_pct < 0.55:
+            return '2:1'
+        elif 0.62 < price_drop_pct < 0.72:
+            return '3:1'
+        elif 0.74 < price_drop_pct < 0.82:
+            return '4:1'
+    return None
+
+def test_common_split_ratios():
+    """Typical split drops map to their ratio; other moves do not"""
+    assert classify_split_ratio(100.0, 50.0) == '2:1'
+    assert classify_split_ratio(90.0, 30.0) == '3:1'
+    assert classify_split_ratio(100.0, 25.0) == '4:1'
+    assert classify_split_ratio(100.0, 40.0) is None   # 60% drop falls between bands
+    assert classify_split_ratio(100.0, 95.0) is None   # Normal move
+    assert classify_split_ratio(100.0, 200.0) is None  # Reverse split / rally
+    print("✅ Common split ratios classified")
+
+def test_band_edges_and_bad_prices():
+    """Band edges are exclusive and non-positive prices never classify"""
+    for low, high in ((0.45, 0.55), (0.62, 0.72), (0.74, 0.82)):
+        assert classify_split_ratio(100.0, 100.0 * (1 - low)) == _reference_split_ratio(100.0, 100.0 * (1 - low))
+        assert classify_split_ratio(100.0, 100.0 * (1 - high)) == _reference_split_ratio(100.0, 100.0 * (1 - high))
+    for yesterday_close, today_open in ((0.0, 50.0), (100.0, 0.0), (-10.0, 5.0), (100.0, -5.0)):
+        assert classify_split_ratio(yesterday_close, today_open) is None
+        assert not is_unusual_gap(yesterday_close, today_open)
+    print("✅ Band edges and bad prices handled")
+
+def test_matches_original_checks():
+    """Randomized comparison against the original inline split and gap checks"""
+    rng = random.Random(3)
+    for _ in range(100000):
+        yesterday_close = rng.uniform(0.5, 500.0)
+        today_open = yesterday_close * rng.uniform(0.1, 1.5)
+        assert classify_split_ratio(yesterday_close, today_open) == _reference_split_ratio(yesterday_close, today_open)
+        gap_pct = abs(today_open - yesterday_close) / yesterday_close
+        assert is_unusual_gap(yesterday_close, today_open) == (gap_pct > 0.15)
+    print("✅ Classifiers match the original inline checks")
+
+def main():
+    """Run the tests"""
+    print("🧪 Testing split and gap classification...")
+    test_common_split_ratios()
+    test_band_edges_and_bad_prices()
+    test_matches_original_checks()
+
+if __name__ == "__main__":
+    main()
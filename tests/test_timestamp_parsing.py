@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test bar/quote timestamp parsing and quote freshness gating in the strategy
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from time import time as epoch_seconds
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from enhanced_momentum_strategy import EventDrivenMomentumStrategy, _parse_epoch, _parse_timestamp
+
+EXPECTED = datetime(2024, 3, 15, 14, 30, 5, tzinfo=timezone.utc)
+
+def test_parse_timestamp_formats():
+    """Every supported timestamp shape parses to the same aware UTC datetime"""
+    cases = [
+        '2024-03-15T14:30:05Z',
+        '2024-03-15T14:30:05+00:00',
+        '2024-03-15T10:30:05-04:00',
+        '2024-03-15T14:30:05',          # Naive strings are UTC
+        '2024-03-15 14:30:05',
+        EXPECTED.timestamp(),           # Unix epoch
+        int(EXPECTED.timestamp()),
+        str(int(EXPECTED.timestamp())),
+        EXPECTED.replace(tzinfo=None),  # Naive datetimes are UTC
+        EXPECTED,
+    ]
+    for value in cases:
+        parsed = _parse_timestamp(value)
+        assert parsed == EXPECTED, f"{value!r} parsed as {parsed!r}"
+        assert parsed.tzinfo is not None, f"{value!r} parsed as a naive datetime"
+
+    # Fractional seconds, including the nanosecond precision Alpaca sends
+    fractional = EXPECTED.replace(microsecond=123456)
+    for value in ('2024-03-15T14:30:05.123456Z', '2024-03-15T14:30:05.123456789Z', '2024-03-15T14:30:05.123456'):
+        assert _parse_timestamp(value) == fractional, value
+    print("✅ Timestamp formats parse consistently")
+
+def test_parse_epoch():
+    """_parse_epoch passes numeric epochs through and converts strings via _parse_timestamp"""
+    epoch = EXPECTED.timestamp()
+    assert _parse_epoch(epoch) == epoch
+    assert _parse_epoch(int(epoch)) == epoch
+    assert _parse_epoch('2024-03-15T14:30:05Z') == epoch
+    for bad in ('not a timestamp', '2024-13-45T99:99:99Z'):
+        try:
+            _parse_epoch(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad!r} should not parse")
+    print("✅ Epoch conversion works")
+
+def test_quote_freshness_gate():
+    """Only numeric epoch quotes get the 5-minute gate; ISO string quotes use the 24h check"""
+    strategy = EventDrivenMomentumStrategy()
+    now = datetime.now(timezone.utc)
+
+    # Numeric epoch quotes: 5-minute gate
+    assert strategy._validate_data_freshness('TEST', None, {'timestamp': epoch_seconds() - 60})
+    assert not strategy._validate_data_freshness('TEST', None, {'timestamp': epoch_seconds() - 600})
+
+    # ISO string quotes (Alpaca): older than 5 minutes is fine pre-market/after hours, older than 24h is not
+    two_hours_old = (now - timedelta(hours=2)).isoformat().replace('+00:00', 'Z')
+    two_days_old = (now - timedelta(days=2)).isoformat().replace('+00:00', 'Z')
+    assert strategy._validate_data_freshness('TEST', None, {'timestamp': two_hours_old})
+    assert not strategy._validate_data_freshness('TEST', None, {'timestamp': two_days_old})
+    print("✅ Quote freshness gating matches quote timestamp type")
+
+def main():
+    """Run the tests"""
+    print("🧪 Testing timestamp parsing...")
+    test_parse_timestamp_formats()
+    test_parse_epoch()
+    test_quote_freshness_gate()
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ Handles rate limits, data issues, and ensures comprehensive coverage
 
 import asyncio
 import logging
+import sys
 from typing import Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -18,12 +19,15 @@ from config import *
 
 logger = logging.getLogger(__name__)
 
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep the regular __dict__ layout
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 class AnalysisTier(Enum):
     FAST_SCREEN = 1      # Basic price/volume analysis (no external API calls)
     PRIORITY_ANALYSIS = 2 # Enhanced analysis with some data calls
     DEEP_DIVE = 3        # Full technical + AI analysis
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class AnalysisResult:
     """Result from tiered analysis"""
     symbol: str
@@ -36,7 +40,7 @@ class AnalysisResult:
     needs_deeper_analysis: bool = False
     priority_score: float = 0.0
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class StockData:
     """Consolidated stock data from all sources"""
     symbol: str
@@ -138,6 +142,17 @@ class TieredAnalyzer:
         """
         results = []
         
+        # Prefetch Alpaca fallback quotes in bulk (one request per 100 symbols instead of one per symbol)
+        to_screen = [symbol for symbol in symbols
+                     if not self._is_cached_and_fresh(symbol, AnalysisTier.FAST_SCREEN)
+                     and self._is_screenable_symbol(symbol)]
+        prefetched_quotes = {}
+        if to_screen:
+            try:
+                prefetched_quotes = await self.api_gateway.get_quotes_bulk(to_screen)
+            except Exception as e:
+                logger.debug(f"Bulk quote prefetch failed: {e}")
+        
         for symbol in symbols:
             try:
                 # Check cache first
@@ -146,7 +161,7 @@ class TieredAnalyzer:
                     continue
                 
                 # Fast analysis using basic heuristics
-                result = await self._fast_screen_single(symbol)
+                result = await self._fast_screen_single(symbol, prefetched_quotes.get(symbol))
                 if result:
                     results.append(result)
                     self._cache_result(symbol, result, AnalysisTier.FAST_SCREEN)
@@ -159,13 +174,19 @@ class TieredAnalyzer:
         
         return results
     
-    async def _fast_screen_single(self, symbol: str) -> Optional[AnalysisResult]:
+    @staticmethod
+    def _is_screenable_symbol(symbol: str) -> bool:
+        """Skip complex symbols (long tickers, share classes, units)"""
+        return len(symbol) <= 5 and '.' not in symbol and '-' not in symbol
+    
+    async def _fast_screen_single(self, symbol: str, alpaca_quote: Optional[Dict] = None) -> Optional[AnalysisResult]:
         """
         Basic screening using symbol characteristics and minimal data
+        alpaca_quote is the bulk-prefetched fallback quote, if any
         """
         try:
             # Basic symbol filtering
-            if len(symbol) > 5 or '.' in symbol or '-' in symbol:
+            if not self._is_screenable_symbol(symbol):
                 return None  # Skip complex symbols
             
             # Try to get minimal quote data (fast)
@@ -178,8 +199,7 @@ class TieredAnalyzer:
             if not quote_data or not quote_data.get('current_price'):
                 # No data available - try alternative quote sources
                 try:
-                    # Try alternative quote from Alpaca
-                    alpaca_quote = await self.api_gateway.get_latest_quote(symbol)
+                    # Try alternative quote from Alpaca (prefetched in bulk by _fast_screen_all)
                     if alpaca_quote:
                         current_price = float(alpaca_quote.get('ask_price', 0)) or float(alpaca_quote.get('bid_price', 0))
                         if current_price > 0:
@@ -537,7 +557,7 @@ class TieredAnalyzer:
         """
         Tier 3: Full deep dive analysis for highest priority stocks
         """
-        results = []
+        results = {}  # symbol -> result, returned in top_symbols order
         
         # Only analyze top candidates for deep dive
         max_deep_dive = min(50, len(symbols))
@@ -545,12 +565,27 @@ class TieredAnalyzer:
         
         logger.info(f"🔬 Starting deep dive analysis for {len(top_symbols)} stocks")
         
+        # One timestamp for every signal generated in this batch
+        scan_timestamp = datetime.now()
+        
+        # Fetch sequentially (rate limited), then analyze every fetched symbol in one strategy call
+        symbols_bars = {}
+        quotes = {}
         for symbol in top_symbols:
             try:
-                result = await self._deep_dive_single(symbol)
-                if result:
-                    results.append(result)
+                # Check cache
+                if self._is_cached_and_fresh(symbol, AnalysisTier.DEEP_DIVE):
+                    results[symbol] = self.analysis_cache[symbol]
                     self.stats['deep_dive_count'] += 1
+                    continue
+                
+                # Get comprehensive data
+                bars = await self.supplemental_data_provider.get_historical_data(symbol, days=5, min_bars=5)
+                quote_data = await self.supplemental_data_provider.get_current_quote_fast(symbol)
+                
+                if bars and len(bars) >= 5:
+                    symbols_bars[symbol] = bars
+                    quotes[symbol] = quote_data
                 
                 # Rate limiting
                 await asyncio.sleep(0.2)
@@ -559,55 +594,42 @@ class TieredAnalyzer:
                 logger.debug(f"Deep dive failed for {symbol}: {e}")
                 continue
         
-        return results
+        if not symbols_bars:
+            return list(results.values())
         
-    async def _deep_dive_single(self, symbol: str) -> Optional[AnalysisResult]:
-        """
-        Full deep dive analysis using existing strategy system
-        """
+        # Use existing strategy system for full analysis
         try:
-            # Check cache
-            if self._is_cached_and_fresh(symbol, AnalysisTier.DEEP_DIVE):
-                return self.analysis_cache[symbol]
+            trading_signals = await self.strategy.analyze_symbols_batch(
+                symbols_bars, quotes, tick_timestamp=scan_timestamp
+            )
+        except Exception as e:
+            logger.debug(f"Deep dive analysis failed for {len(symbols_bars)} symbols: {e}")
+            return list(results.values())
+        
+        for symbol in symbols_bars:
+            trading_signal = trading_signals.get(symbol)
+            if not trading_signal:
+                continue
             
-            # Get comprehensive data
-            bars = await self.supplemental_data_provider.get_historical_data(symbol, days=5, min_bars=5)
-            quote_data = await self.supplemental_data_provider.get_current_quote_fast(symbol)
+            self.stats['signals_generated'] += 1
             
-            if not bars or len(bars) < 5:
-                return None
-            
-            # Use existing strategy system for full analysis
-            trading_signal = await self.strategy.analyze_symbol(
+            result = AnalysisResult(
                 symbol=symbol,
-                bars=bars,
-                quote_data=quote_data,
-                data_sources=['enhanced']
+                tier_completed=AnalysisTier.DEEP_DIVE,
+                signal_strength=trading_signal.confidence,
+                confidence=trading_signal.confidence,
+                recommendation=trading_signal.action,
+                reasoning=f"Deep dive: {trading_signal.reasoning}",
+                data_quality="EXCELLENT",
+                needs_deeper_analysis=False,
+                priority_score=trading_signal.confidence
             )
             
-            if trading_signal:
-                self.stats['signals_generated'] += 1
-                
-                result = AnalysisResult(
-                    symbol=symbol,
-                    tier_completed=AnalysisTier.DEEP_DIVE,
-                    signal_strength=trading_signal.confidence,
-                    confidence=trading_signal.confidence,
-                    recommendation=trading_signal.action,
-                    reasoning=f"Deep dive: {trading_signal.reasoning}",
-                    data_quality="EXCELLENT",
-                    needs_deeper_analysis=False,
-                    priority_score=trading_signal.confidence
-                )
-                
-                self._cache_result(symbol, result, AnalysisTier.DEEP_DIVE)
-                return result
-            
-            return None
-            
-        except Exception as e:
-            logger.debug(f"Deep dive analysis failed for {symbol}: {e}")
-            return None
+            self._cache_result(symbol, result, AnalysisTier.DEEP_DIVE)
+            results[symbol] = result
+            self.stats['deep_dive_count'] += 1
+        
+        return [results[symbol] for symbol in top_symbols if symbol in results]
     
     def _update_priorities(self, symbols: List[str], new_results: List[AnalysisResult]) -> List[str]:
         """
@@ -650,10 +672,17 @@ class TieredAnalyzer:
         logger.info(f"🚨 Emergency analysis for {len(symbols)} missed stocks")
         results = []
         
+        prefetched_quotes = {}
+        try:
+            prefetched_quotes = await self.api_gateway.get_quotes_bulk(
+                [symbol for symbol in symbols if self._is_screenable_symbol(symbol)])
+        except Exception as e:
+            logger.debug(f"Bulk quote prefetch failed: {e}")
+        
         for symbol in symbols:
             try:
                 # Very basic analysis
-                result = await self._fast_screen_single(symbol)
+                result = await self._fast_screen_single(symbol, prefetched_quotes.get(symbol))
                 if result:
                     result.reasoning = f"Emergency recovery: {result.reasoning}"
                     result.priority_score += 0.1  # Slight boost for recovery